@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+
+from blog.models import Category, Post
+
+
+def _feed_size():
+    return getattr(settings, "BLOG_FEED_SIZE", 20)
+
+
+class PostsFeed(Feed):
+    """The latest posts, or the latest in one category."""
+
+    def get_object(self, request, category=None):
+        if category is None:
+            return None
+        return Category.objects.get(slug=category)
+
+    def title(self, category):
+        if category is None:
+            return "Lucas Stone-Drake's blog"
+        return f"Lucas Stone-Drake's blog: {category.name}"
+
+    def link(self, category):
+        if category is None:
+            return reverse("blog_index")
+        return category.get_absolute_url()
+
+    def description(self, category):
+        return self.title(category)
+
+    def items(self, category):
+        posts = Post.objects.listing()
+        if category is not None:
+            posts = posts.filter(categories=category)
+        return posts[: _feed_size()]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.excerpt
+
+    def item_pubdate(self, post):
+        return post.created_on
+
+    def item_updateddate(self, post):
+        return post.last_modified
+
+    def item_categories(self, post):
+        return [category.name for category in post.categories.all()]
+
+
+class AtomPostsFeed(PostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, category):
+        return self.description(category)
+
+
+FEEDS = {"rss": PostsFeed(), "atom": AtomPostsFeed()}
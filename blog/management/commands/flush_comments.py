@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog import spool
+
+
+class Command(BaseCommand):
+    help = "Save comments waiting in the write-behind spool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep flushing, waiting this many seconds in between.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = spool.flush(options["batch_size"])
+            self.stdout.write(f"Saved {count} comments")
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of blog posts."
+
+    def handle(self, *args, **options):
+        count = search.rebuild_index()
+        self.stdout.write(f"Indexed {count} posts")
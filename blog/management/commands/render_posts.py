@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from personal_portfolio.cache import invalidate
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Regenerate the stored excerpt and HTML of every blog post."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        batch = []
+        count = 0
+        for post in Post.objects.only("id", "body").iterator(chunk_size=batch_size):
+            post.render()
+            batch.append(post)
+            if len(batch) >= batch_size:
+                count += self._flush(batch)
+        count += self._flush(batch)
+        self.stdout.write(f"Rendered {count} posts")
+
+    def _flush(self, batch):
+        # bulk_update leaves last_modified alone, a backfill isn't an edit
+        Post.objects.bulk_update(batch, ["excerpt", "body_html"])
+        # bulk_update doesn't send post_save, so invalidate the pages here
+        invalidate("posts", *(f"post:{post.pk}" for post in batch))
+        count = len(batch)
+        batch.clear()
+        return count
@@ -0,0 +1,23 @@
+# Generated by Django 3.1.7 on 2026-10-18 08:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_auto_20210426_1812'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='body_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
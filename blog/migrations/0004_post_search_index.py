@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE blog_post_fts USING fts5("
+        "title, body, tokenize = 'porter unicode61')"
+    )
+    schema_editor.execute(
+        "INSERT INTO blog_post_fts (rowid, title, body) "
+        "SELECT id, title, body FROM blog_post"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute("DROP TABLE blog_post_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_post_rendered_body'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
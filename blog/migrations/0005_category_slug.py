@@ -0,0 +1,35 @@
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def populate_slugs(apps, schema_editor):
+    Category = apps.get_model("blog", "Category")
+    taken = set()
+    for category in Category.objects.order_by("pk"):
+        slug = slugify(category.name) or str(category.pk)
+        if slug in taken:
+            slug = f"{slug}-{category.pk}"
+        taken.add(slug)
+        category.slug = slug
+        category.save(update_fields=["slug"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(max_length=30, null=True),
+        ),
+        migrations.RunPython(populate_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(max_length=30, unique=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.1.7 on 2026-10-18 14:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='created_on',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+RESERVED_SLUGS = {"search", "feed"}
+
+
+def rename_reserved_slugs(apps, schema_editor):
+    """Move categories off slugs that other /blog/ URLs hide."""
+    Category = apps.get_model("blog", "Category")
+    for category in Category.objects.order_by("pk"):
+        slug = category.slug
+        if slug == str(category.pk):
+            # 0005 used the pk for names without a slug
+            category.slug = f"category-{category.pk}"
+        elif slug in RESERVED_SLUGS or slug.isdigit():
+            category.slug = f"{slug}-{category.pk}"
+        else:
+            continue
+        category.save(update_fields=["slug"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_comment_created_on'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_reserved_slugs, migrations.RunPython.noop),
+    ]
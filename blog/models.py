@@ -1,12 +1,66 @@
-from django.db import models
+import uuid
+
+from django.db import models, transaction
+from django.db.models import Exists, OuterRef, Q, Subquery
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import linebreaks
+from django.utils.text import slugify
+
+EXCERPT_LENGTH = 400
+
+# paths under /blog/ which would hide a category with the same slug, as
+# would numbers, which are post ids
+RESERVED_SLUGS = {"search", "feed"}
+
+
+def reserved_slug(slug):
+    return slug in RESERVED_SLUGS or slug.isdigit()
 
 
 class Category(models.Model):
     name = models.CharField(max_length=21)
+    slug = models.SlugField(max_length=30, unique=True)
 
     def __str__(self):
         return self.name
 
+    def get_absolute_url(self):
+        return reverse("blog_category", kwargs={"category": self.slug})
+
+    def save(self, *args, **kwargs):
+        if self.slug and not reserved_slug(self.slug):
+            super().save(*args, **kwargs)
+            return
+        slug = slugify(self.name)
+        if (
+            slug
+            and not reserved_slug(slug)
+            and not Category.objects.filter(slug=slug).exists()
+        ):
+            self.slug = slug
+            super().save(*args, **kwargs)
+            return
+        # like the migrations, add the pk, which a new row only has once
+        # it's inserted
+        with transaction.atomic():
+            if self.pk is None:
+                self.slug = uuid.uuid4().hex[:30]
+                super().save(*args, **kwargs)
+                args, kwargs = (), {"update_fields": ["slug"]}
+            self.slug = f"{slug or 'category'}-{self.pk}"
+            super().save(*args, **kwargs)
+
+
+class PostQuerySet(models.QuerySet):
+    def listing(self):
+        """Posts for index pages: categories prefetched, no full body loaded."""
+        return (
+            self.defer("body", "body_html")
+            .prefetch_related("categories")
+            .order_by("-created_on", "-pk")
+        )
+
 
 class Post(models.Model):
     title = models.CharField(max_length=255)
@@ -15,16 +69,68 @@ class Post(models.Model):
     last_modified = models.DateTimeField(auto_now=True)
     categories = models.ManyToManyField("Category", related_name="posts")
     link = models.URLField()
+    excerpt = models.TextField(blank=True, editable=False)
+    body_html = models.TextField(blank=True, editable=False)
+
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_on", "id"], name="post_created_idx"),
+            models.Index(fields=["last_modified"], name="post_modified_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
+    def get_absolute_url(self):
+        return reverse("blog_detail", kwargs={"pk": self.pk})
+
+    def render(self):
+        """Refresh the excerpt and HTML stored alongside ``body``."""
+        self.excerpt = self.body[:EXCERPT_LENGTH]
+        self.body_html = linebreaks(self.body, autoescape=True)
+
+    def save(self, *args, **kwargs):
+        self.render()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "body" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "excerpt", "body_html"}
+        super().save(*args, **kwargs)
+
+
+class CommentQuerySet(models.QuerySet):
+    def since(self, comment_id):
+        """Comments after ``comment_id``, oldest first.
+
+        The comment is looked for on the same post. If it's been deleted, or
+        isn't one of the post's comments, the comments with greater ids are
+        taken to be the later ones.
+        """
+        anchors = Comment.objects.filter(pk=comment_id, post=OuterRef("post"))
+        anchor = Subquery(anchors.values("created_on")[:1])
+        return self.filter(
+            Q(created_on__gt=anchor)
+            | Q(created_on=anchor, pk__gt=comment_id)
+            | Q(~Exists(anchors), pk__gt=comment_id)
+        ).order_by("created_on", "pk")
+
 
 class Comment(models.Model):
     author = models.CharField(max_length=60)
     body = models.TextField()
-    created_on = models.DateTimeField(auto_now_add=True)
+    # not auto_now_add, so spooled comments keep the time they were made
+    created_on = models.DateTimeField(default=timezone.now, editable=False)
     post = models.ForeignKey("Post", on_delete=models.CASCADE)
 
+    objects = CommentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["post", "created_on", "id"], name="comment_post_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.author
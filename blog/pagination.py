@@ -0,0 +1,91 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from django.http import Http404
+
+
+class KeysetPage:
+    """One page of a queryset paginated on (created_on, pk) without OFFSET."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+def encode_cursor(obj):
+    value = f"{obj.created_on.isoformat()}|{obj.pk}".encode()
+    return base64.urlsafe_b64encode(value).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_on, pk = value.decode().split("|")
+        return datetime.fromisoformat(created_on), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise Http404("Invalid page cursor")
+
+
+def _seek(queryset, cursor, forwards):
+    """Filter to rows strictly after ``cursor`` in the direction of travel."""
+    created_on, pk = decode_cursor(cursor)
+    op = "gt" if forwards else "lt"
+    return queryset.filter(
+        Q(**{f"created_on__{op}": created_on})
+        | Q(created_on=created_on, **{f"pk__{op}": pk})
+    )
+
+
+def keyset_paginate(queryset, params, per_page, descending=True):
+    """Paginate ``queryset`` using the ``after``/``before`` cursors in ``params``.
+
+    Each page is a single indexed range scan of ``per_page + 1`` rows, so the
+    cost of a page doesn't depend on how deep into the results it is.
+    """
+    after = params.get("after")
+    before = params.get("before")
+    backwards = before is not None and after is None
+    # travelling "forwards" in key order means ascending created_on
+    forwards = descending == backwards
+    ordering = ("created_on", "pk") if forwards else ("-created_on", "-pk")
+
+    queryset = queryset.order_by(*ordering)
+    cursor = before if backwards else after
+    if cursor is not None:
+        queryset = _seek(queryset, cursor, forwards)
+
+    rows = list(queryset[: per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not rows:
+        return KeysetPage(rows)
+
+    if backwards:
+        rows.reverse()
+        return KeysetPage(
+            rows,
+            next_cursor=encode_cursor(rows[-1]),
+            previous_cursor=encode_cursor(rows[0]) if has_more else None,
+        )
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(rows[-1]) if has_more else None,
+        previous_cursor=encode_cursor(rows[0]) if cursor is not None else None,
+    )
@@ -0,0 +1,112 @@
+"""Full-text search over posts using an SQLite FTS5 table.
+
+``blog_post_fts`` holds a copy of each post's title and body keyed by the
+post id. It is created by a migration, kept up to date by the signal
+handlers in ``blog.signals`` and can be rebuilt with the
+``rebuild_search_index`` command. Other database backends fall back to a
+plain ``icontains`` lookup.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from blog.models import Post
+
+TABLE = "blog_post_fts"
+MAX_RESULTS = 20
+# bm25 column weights, a match in the title counts for more than the body
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+# control characters can't appear in the escaped snippet, so they're safe
+# placeholders for the highlight markup
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+# FTS5 fails on a NUL even inside a quoted term, so they're all dropped
+_CONTROL = re.compile(r"[\x00-\x1f\x7f]")
+
+
+def is_supported():
+    return connection.vendor == "sqlite"
+
+
+def index_post(post):
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [post.pk])
+        cursor.execute(
+            f"INSERT INTO {TABLE} (rowid, title, body) VALUES (%s, %s, %s)",
+            [post.pk, post.title, post.body],
+        )
+
+
+def unindex_post(pk):
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild_index():
+    """Re-create the index from the posts table and return the row count."""
+    if not is_supported():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        cursor.execute(
+            f"INSERT INTO {TABLE} (rowid, title, body) "
+            f"SELECT id, title, body FROM {Post._meta.db_table}"
+        )
+        cursor.execute(f"SELECT count(*) FROM {TABLE}")
+        return cursor.fetchone()[0]
+
+
+def _match_expression(query):
+    # quote every term so user input can't use FTS5 query syntax
+    terms = ['"{}"'.format(term.replace('"', '""')) for term in query.split()]
+    return " ".join(terms)
+
+
+def _highlight(snippet):
+    return mark_safe(
+        escape(snippet).replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+    )
+
+
+def search_posts(query, limit=MAX_RESULTS):
+    """Return posts matching ``query`` best first, each with a ``snippet``."""
+    query = _CONTROL.sub(" ", query)
+    expression = _match_expression(query)
+    if not expression:
+        return []
+
+    if not is_supported():
+        posts = Post.objects.listing().filter(
+            Q(title__icontains=query) | Q(body__icontains=query)
+        )[:limit]
+        for post in posts:
+            post.snippet = post.excerpt
+        return list(posts)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, snippet({TABLE}, 1, %s, %s, '…', 24) FROM {TABLE} "
+            f"WHERE {TABLE} MATCH %s ORDER BY bm25({TABLE}, %s, %s) LIMIT %s",
+            [_MARK_START, _MARK_END, expression, TITLE_WEIGHT, BODY_WEIGHT, limit],
+        )
+        matches = cursor.fetchall()
+
+    posts = Post.objects.listing().in_bulk([pk for pk, _ in matches])
+    results = []
+    for pk, snippet in matches:
+        if pk in posts:
+            post = posts[pk]
+            post.snippet = _highlight(snippet)
+            results.append(post)
+    return results
@@ -0,0 +1,57 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from personal_portfolio.cache import invalidate
+from personal_portfolio.sitemaps import chunk_tag
+
+from blog import search
+from blog.models import Category, Comment, Post
+
+SEARCHABLE_FIELDS = {"title", "body"}
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCHABLE_FIELDS & set(update_fields):
+        return
+    search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    search.unindex_post(instance.pk)
+
+
+def invalidate_posts(pks):
+    invalidate("posts", *(f"post:{pk}" for pk in pks))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    invalidate_posts([instance.pk])
+    invalidate(chunk_tag(instance.pk))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    invalidate(f"post:{instance.post_id}")
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def invalidate_category_pages(sender, instance, **kwargs):
+    # pre_delete, as the links to the category's posts are gone by post_delete
+    invalidate_posts(instance.posts.values_list("pk", flat=True))
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+def invalidate_post_category_pages(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        invalidate_posts([instance.pk])
+    elif action == "pre_clear":
+        invalidate_posts(instance.posts.values_list("pk", flat=True))
+    else:
+        invalidate_posts(pk_set)
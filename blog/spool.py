@@ -0,0 +1,266 @@
+"""Write-behind spool for blog comments.
+
+With ``COMMENT_WRITE_BEHIND`` on, a valid comment is written to a file in
+``COMMENT_SPOOL_DIR`` instead of the database, and a background thread
+inserts the spooled comments in batches with ``bulk_create``. A burst of
+comments then takes one write transaction per batch rather than one per
+comment, so page views aren't left waiting on the SQLite write lock.
+
+A spool file is only removed once its batch has been committed, so a
+crash can't lose a comment, though it can insert one twice. Until their
+comments are flushed, visitors see them through the spool ids kept in a
+signed cookie. That's a cookie rather than the session, as saving a new
+session would be a database write of its own.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.utils import timezone
+from personal_portfolio.cache import invalidate
+
+from blog.models import Comment, Post
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+COOKIE_NAME = "pending_comments"
+COOKIE_SALT = "blog.spool"
+COOKIE_MAX_AGE = 60 * 60 * 24
+# keeps the cookie well under the 4KB browsers allow
+MAX_PENDING = 20
+
+logger = logging.getLogger(__name__)
+
+_flush_lock = threading.Lock()
+_worker_lock = threading.Lock()
+_worker = None
+
+
+def enabled():
+    return getattr(settings, "COMMENT_WRITE_BEHIND", False)
+
+
+def spool_dir():
+    path = getattr(settings, "COMMENT_SPOOL_DIR", None)
+    if not path:
+        raise ImproperlyConfigured("COMMENT_WRITE_BEHIND needs COMMENT_SPOOL_DIR")
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _write(path, data):
+    # write to a temporary name first so the flusher never sees half a file
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def enqueue(request, post, author, body):
+    """Spool a comment on ``post`` and return it, unsaved."""
+    comment = Comment(author=author, body=body, post=post, created_on=timezone.now())
+    # names sort in the order the comments were made
+    name = f"{time.time_ns():020d}-{uuid.uuid4().hex}"
+    data = {
+        "post_id": post.pk,
+        "author": author,
+        "body": body,
+        "created_on": comment.created_on.isoformat(),
+    }
+    _write(spool_dir() / f"{name}.json", data)
+
+    _set_entries(request, (_entries(request) + [(post.pk, name)])[-MAX_PENDING:])
+    start_worker()
+    return comment
+
+
+def _entries(request):
+    """The ``(post id, spool name)`` pairs of the visitor's spooled comments."""
+    if not enabled():
+        return []
+    if not hasattr(request, "_pending_comments"):
+        value = request.get_signed_cookie(COOKIE_NAME, "", salt=COOKIE_SALT)
+        entries = value.split(",") if value else []
+        try:
+            request._pending_comments = [
+                (int(pk), name) for pk, name in (entry.split(":") for entry in entries)
+            ]
+        except ValueError:
+            request._pending_comments = []
+    return request._pending_comments
+
+
+def _set_entries(request, entries):
+    request._pending_comments = entries
+    request._pending_comments_changed = True
+
+
+def update_cookie(request, response):
+    """Save changes to the visitor's spooled comments in ``response``."""
+    if not getattr(request, "_pending_comments_changed", False):
+        return
+    if request._pending_comments:
+        value = ",".join(f"{pk}:{name}" for pk, name in request._pending_comments)
+        response.set_signed_cookie(
+            COOKIE_NAME,
+            value,
+            salt=COOKIE_SALT,
+            max_age=COOKIE_MAX_AGE,
+            httponly=True,
+            samesite="Lax",
+        )
+    else:
+        response.delete_cookie(COOKIE_NAME, samesite="Lax")
+
+
+def has_pending(request):
+    """Whether the visitor has comments that haven't been flushed yet."""
+    return bool(_entries(request))
+
+
+def pending_ids(request, post_id):
+    return [name for pk, name in _entries(request) if pk == post_id]
+
+
+def pending_comments(request, post_id):
+    """The visitor's own spooled comments on a post, oldest first.
+
+    Entries whose file has gone have been flushed and are forgotten.
+    """
+    entries = _entries(request)
+    if not entries:
+        return []
+
+    directory = spool_dir()
+    remaining = []
+    comments = []
+    for pk, name in entries:
+        try:
+            with open(directory / f"{name}.json") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            continue
+        remaining.append((pk, name))
+        if pk == post_id:
+            comments.append(_comment(data))
+
+    if len(remaining) != len(entries):
+        _set_entries(request, remaining)
+    return comments
+
+
+def _comment(data):
+    return Comment(
+        author=data["author"],
+        body=data["body"],
+        post_id=data["post_id"],
+        created_on=datetime.fromisoformat(data["created_on"]),
+    )
+
+
+@contextmanager
+def _locked(directory):
+    # one flusher at a time, across threads and across processes
+    with _flush_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(directory / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def flush(batch_size=None):
+    """Insert spooled comments in batches and return how many were saved."""
+    if batch_size is None:
+        batch_size = getattr(settings, "COMMENT_FLUSH_BATCH_SIZE", 100)
+    directory = spool_dir()
+    count = 0
+    with _locked(directory):
+        while True:
+            paths = sorted(directory.glob("*.json"))[:batch_size]
+            if not paths:
+                return count
+            count += _flush_batch(paths)
+
+
+def _flush_batch(paths):
+    comments = []
+    done = []
+    for path in paths:
+        try:
+            with open(path) as f:
+                comments.append(_comment(json.load(f)))
+        except (ValueError, KeyError):
+            logger.exception("Setting aside unreadable spooled comment %s", path.name)
+            path.rename(path.with_suffix(".bad"))
+        else:
+            done.append(path)
+
+    with transaction.atomic():
+        # comments on posts deleted since they were made are dropped
+        existing = set(
+            Post.objects.filter(
+                pk__in={comment.post_id for comment in comments}
+            ).values_list("pk", flat=True)
+        )
+        comments = [comment for comment in comments if comment.post_id in existing]
+        Comment.objects.bulk_create(comments)
+
+    for path in done:
+        path.unlink()
+    # bulk_create doesn't send post_save, so invalidate the pages here
+    invalidate(*(f"post:{pk}" for pk in existing))
+    return len(comments)
+
+
+def start_worker():
+    """Start the background flusher if it isn't running.
+
+    It's started by the WSGI and ASGI entry points, so management commands
+    and the test runner don't get one, and by ``enqueue`` in case it has
+    stopped since, or was started in a process that has since forked.
+    ``COMMENT_FLUSH_INTERVAL`` is how many seconds it waits between
+    flushes. Setting it to None leaves flushing to the ``flush_comments``
+    command.
+    """
+    global _worker
+    interval = getattr(settings, "COMMENT_FLUSH_INTERVAL", 1.0)
+    if interval is None:
+        return
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(
+                target=_run, args=(interval,), name="comment-spool", daemon=True
+            )
+            _worker.start()
+
+
+def _run(interval):
+    while True:
+        time.sleep(interval)
+        try:
+            flush()
+        except Exception:
+            logger.exception("Flushing the comment spool failed")
+        finally:
+            connection.close()
@@ -0,0 +1,28 @@
+import hashlib
+
+from django import template
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@register.simple_tag
+def category_links(post):
+    """Render links to ``post``'s categories, cached in this process.
+
+    The key is made from the categories' ids, slugs and names, which
+    listings prefetch, so a renamed category or a change to the post's
+    categories gives a new key without asking the shared cache for a
+    version. Posts in the same categories share a fragment.
+    """
+    categories = [(c.pk, c.slug, c.name) for c in post.categories.all()]
+    digest = hashlib.md5(repr(categories).encode()).hexdigest()
+    key = f"category-links:{digest}"
+    fragments = caches["fragments"]
+    html = fragments.get(key)
+    if html is None:
+        html = render_to_string("_category_links.html", {"post": post})
+        fragments.set(key, html, None)
+    return mark_safe(html)
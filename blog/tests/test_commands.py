@@ -0,0 +1,56 @@
+from io import StringIO
+
+from blog import search
+from blog.models import Post
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+class RenderPostsCommandTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            Post.objects.create(title=f"Blog Post {i}", body=f"Line {i}\nmore")
+        # simulate rows written before the rendered fields existed
+        Post.objects.update(excerpt="", body_html="")
+
+    def test_backfills_rendered_fields(self):
+        out = StringIO()
+        call_command("render_posts", batch_size=2, stdout=out)
+
+        self.assertIn("Rendered 3 posts", out.getvalue())
+        for post in Post.objects.all():
+            self.assertEqual(post.body, post.excerpt)
+            self.assertIn("<br>", post.body_html)
+
+    @override_settings(PAGE_CACHE=True)
+    def test_invalidates_cached_pages(self):
+        cache.clear()
+        post = Post.objects.first()
+        urls = [reverse("blog_index"), reverse("blog_detail", args=[post.pk])]
+        for url in urls:
+            self.assertNotContains(self.client.get(url), "Line ")
+
+        call_command("render_posts", batch_size=2, stdout=StringIO())
+
+        self.assertContains(self.client.get(urls[0]), "Line ")
+        self.assertContains(self.client.get(urls[1]), "Line ")
+
+
+class RebuildSearchIndexCommandTest(TestCase):
+    def test_rebuilds_index(self):
+        Post.objects.create(title="Search me", body="findable")
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM blog_post_fts")
+        self.assertEqual([], search.search_posts("findable"))
+
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+
+        self.assertIn("Indexed 1 posts", out.getvalue())
+        self.assertEqual(
+            ["Search me"], [p.title for p in search.search_posts("findable")]
+        )
@@ -0,0 +1,101 @@
+from blog.models import Category, Comment, Post
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+class BlogFeedTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Django Tips")
+        cls.post = Post.objects.create(
+            title="Feeds", body="How to add feeds", link="https://example.com/"
+        )
+        cls.post.categories.add(cls.category)
+        Post.objects.create(title="Other", body="Elsewhere", link="https://a.b/")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_atom(self):
+        response = self.client.get(reverse("blog_feed", args=["atom"]))
+
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response["Content-Type"].startswith("application/atom+xml"))
+        self.assertContains(response, "<title>Feeds</title>")
+        self.assertContains(response, "<title>Other</title>")
+        self.assertContains(response, f"/blog/{self.post.pk}/")
+        self.assertContains(response, 'term="Django Tips"')
+
+    def test_rss(self):
+        response = self.client.get(reverse("blog_feed", args=["rss"]))
+
+        self.assertTrue(response["Content-Type"].startswith("application/rss+xml"))
+        self.assertContains(response, "<description>How to add feeds</description>")
+
+    def test_category_feed(self):
+        url = reverse("blog_category_feed", args=["django-tips", "atom"])
+        response = self.client.get(url)
+
+        self.assertContains(response, "<title>Feeds</title>")
+        self.assertNotContains(response, "<title>Other</title>")
+        self.assertContains(response, "/blog/django-tips/")
+
+    def test_missing_feeds(self):
+        for url in [
+            reverse("blog_feed", args=["json"]),
+            reverse("blog_category_feed", args=["missing", "rss"]),
+        ]:
+            self.assertEqual(404, self.client.get(url).status_code, url)
+
+    def test_old_category_name_redirects(self):
+        url = reverse("blog_category_feed", args=["Django Tips", "rss"])
+        response = self.client.get(url)
+        self.assertRedirects(
+            response,
+            reverse("blog_category_feed", args=["django-tips", "rss"]),
+            status_code=301,
+        )
+
+    def test_conditional_get(self):
+        url = reverse("blog_feed", args=["atom"])
+        response = self.client.get(url)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(304, response.status_code)
+
+        self.post.title = "Feeds, edited"
+        self.post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(200, response.status_code)
+
+    @override_settings(PAGE_CACHE=True)
+    def test_cached_until_a_post_changes(self):
+        url = reverse("blog_feed", args=["rss"])
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        Comment.objects.create(author="Ann", body="Hi", post=self.post)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+        self.post.title = "Feeds, edited"
+        self.post.save()
+        self.assertContains(self.client.get(url), "Feeds, edited")
+
+    @override_settings(PAGE_CACHE=True, ALLOWED_HOSTS=["testserver", "example.org"])
+    def test_cached_per_origin(self):
+        url = reverse("blog_feed", args=["rss"])
+        self.client.get(url)
+
+        response = self.client.get(url, secure=True, HTTP_HOST="example.org")
+        self.assertContains(response, "https://example.org/blog/")
+        self.assertNotContains(response, "http://testserver/")
+
+    def test_index_links_to_feeds(self):
+        response = self.client.get(reverse("blog_index"))
+        self.assertContains(response, 'href="/blog/feed/atom/"')
+        response = self.client.get(reverse("blog_category", args=["django-tips"]))
+        self.assertContains(response, 'href="/blog/django-tips/feed/rss/"')
@@ -0,0 +1,140 @@
+import shutil
+import sys
+import tempfile
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+
+from blog import spool
+from blog.apps import BlogConfig
+from blog.models import Comment, Post
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+class SpoolTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = Post.objects.create(title="Blog Post", body="body")
+
+    def setUp(self):
+        cache.clear()
+        self.spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.spool_dir)
+        settings = override_settings(
+            COMMENT_WRITE_BEHIND=True,
+            COMMENT_SPOOL_DIR=self.spool_dir,
+            COMMENT_FLUSH_INTERVAL=None,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.url = reverse("blog_detail", kwargs={"pk": self.post.pk})
+
+    def comment(self, client, author, body="Hello"):
+        return client.post(self.url, {"author": author, "body": body})
+
+
+@override_settings(PAGE_CACHE=True)
+class WriteBehindViewTest(SpoolTestCase):
+    def test_comment_is_spooled(self):
+        response = self.comment(self.client, "Spooled")
+
+        self.assertContains(response, "Spooled")
+        self.assertFalse(Comment.objects.exists())
+
+    def test_author_sees_own_comment_before_flush(self):
+        self.client.get(self.url)  # cache the page
+        self.comment(self.client, "Spooled")
+
+        self.assertContains(self.client.get(self.url), "Spooled")
+        self.assertNotContains(self.client_class().get(self.url), "Spooled")
+
+    def test_author_does_not_get_stale_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.comment(self.client, "Spooled")
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertContains(response, "Spooled")
+
+    def test_flush_saves_comments_in_order(self):
+        self.comment(self.client, "First")
+        self.comment(self.client_class(), "Second")
+        visitor = self.client_class()
+        visitor.get(self.url)  # cache the page
+
+        self.assertEqual(2, spool.flush(batch_size=1))
+
+        comments = list(Comment.objects.filter(post=self.post).order_by("created_on"))
+        self.assertEqual(["First", "Second"], [c.author for c in comments])
+        self.assertContains(visitor.get(self.url), "Second")
+        # shown once, from the database
+        self.assertContains(self.client.get(self.url), "First", count=1)
+        self.assertEqual("", self.client.cookies[spool.COOKIE_NAME].value)
+
+    def test_comments_on_deleted_posts_are_dropped(self):
+        post = Post.objects.create(title="Doomed", body="body")
+        self.client.post(
+            reverse("blog_detail", kwargs={"pk": post.pk}),
+            {"author": "Orphan", "body": "Hello"},
+        )
+        self.comment(self.client, "Kept")
+        post.delete()
+
+        self.assertEqual(1, spool.flush())
+        self.assertEqual(["Kept"], [c.author for c in Comment.objects.all()])
+
+    def test_invalid_comment_is_not_spooled(self):
+        self.comment(self.client, "")
+        self.assertEqual(0, spool.flush())
+
+    def test_enqueue_starts_worker(self):
+        with override_settings(COMMENT_FLUSH_INTERVAL=60), mock.patch.object(
+            spool.threading, "Thread"
+        ) as thread:
+            spool._worker = None
+            self.comment(self.client, "Spooled")
+        thread.return_value.start.assert_called_once_with()
+        spool._worker = None
+
+    def test_entry_points_start_worker(self):
+        with override_settings(COMMENT_FLUSH_INTERVAL=60), mock.patch.object(
+            spool.threading, "Thread"
+        ) as thread:
+            spool._worker = None
+            BlogConfig.create("blog").ready()
+            thread.assert_not_called()
+            for module in ["personal_portfolio.wsgi", "personal_portfolio.asgi"]:
+                sys.modules.pop(module, None)
+                import_module(module)
+                thread.return_value.start.assert_called_once_with()
+                thread.reset_mock()
+                spool._worker = None
+                with override_settings(COMMENT_WRITE_BEHIND=False):
+                    sys.modules.pop(module, None)
+                    import_module(module)
+                thread.assert_not_called()
+
+    @override_settings(BLOG_COMMENTS_PAGE_SIZE=1)
+    def test_flushed_comments_leave_cookie_on_any_page(self):
+        for author in ["First", "Second"]:
+            Comment.objects.create(author=author, body="Hi", post=self.post)
+        self.comment(self.client, "Spooled")
+        spool.flush()
+
+        response = self.client.get(self.url)
+
+        self.assertTrue(response.context["comments_page"].has_next)
+        self.assertEqual("", response.cookies[spool.COOKIE_NAME].value)
+
+
+class FlushCommentsCommandTest(SpoolTestCase):
+    def test_flushes_spool(self):
+        self.comment(self.client, "Spooled")
+        out = StringIO()
+        call_command("flush_comments", stdout=out)
+
+        self.assertIn("Saved 1 comments", out.getvalue())
+        self.assertEqual(["Spooled"], [c.author for c in Comment.objects.all()])
@@ -1,9 +1,12 @@
 import time
 from datetime import datetime
+from unittest import mock
 
 from blog.forms import CommentForm
 from blog.models import Category, Comment, Post
-from django.test import TestCase
+from django.core.cache import cache, caches
+from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 authors = ["Lucas", "James", "Haamiyah"]
@@ -50,13 +53,88 @@ class BlogIndexViewTest(TestCase):
 
         # loop in order of "created_on"
         # TODO add test for ManyToMany field in context
-        for i, post in enumerate(response.context["posts"].order_by("created_on")):
+        for i, post in enumerate(reversed(response.context["posts"])):
             self.assertEqual(f"Blog Post {i}", post.title)
             self.assertEqual("This is the body...", post.body)
             self.assertIsInstance(post.created_on, datetime)
             self.assertIsInstance(post.last_modified, datetime)
             self.assertEqual("https://cscircles.cemc.uwaterloo.ca/", post.link)
 
+    def test_excerpt_context(self):
+        Post.objects.create(title="Long Post", body="x" * 500)
+        response = self.client.get(reverse("blog_index"))
+        self.assertEqual(response.status_code, 200)
+
+        excerpts = {post.title: post.excerpt for post in response.context["posts"]}
+        self.assertEqual("x" * 400, excerpts["Long Post"])
+        self.assertEqual("This is the body...", excerpts["Blog Post 0"])
+
+    def test_query_count_is_constant(self):
+        cats = [Category.objects.create(name=f"Cat {i}") for i in range(3)]
+        for post in Post.objects.all():
+            post.categories.set(cats)
+
+        # the posts and all of their categories
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("blog_index"))
+        self.assertContains(response, "Cat 2", count=5)
+
+        for i in range(20):
+            post = Post.objects.create(title=f"Extra Post {i}")
+            post.categories.set(cats)
+
+        with self.assertNumQueries(2):
+            self.client.get(reverse("blog_index"))
+
+    @override_settings(BLOG_PAGE_SIZE=2)
+    def test_keyset_pagination(self):
+        response = self.client.get(reverse("blog_index"))
+        titles = [post.title for post in response.context["posts"]]
+        self.assertEqual(["Blog Post 4", "Blog Post 3"], titles)
+        page = response.context["page"]
+        self.assertFalse(page.has_previous)
+        self.assertTrue(page.has_next)
+
+        response = self.client.get(reverse("blog_index"), {"after": page.next_cursor})
+        titles = [post.title for post in response.context["posts"]]
+        self.assertEqual(["Blog Post 2", "Blog Post 1"], titles)
+        second_page = response.context["page"]
+
+        response = self.client.get(
+            reverse("blog_index"), {"after": second_page.next_cursor}
+        )
+        titles = [post.title for post in response.context["posts"]]
+        self.assertEqual(["Blog Post 0"], titles)
+        last_page = response.context["page"]
+        self.assertFalse(last_page.has_next)
+
+        # stepping back gives the same page as stepping forwards
+        response = self.client.get(
+            reverse("blog_index"), {"before": last_page.previous_cursor}
+        )
+        titles = [post.title for post in response.context["posts"]]
+        self.assertEqual(["Blog Post 2", "Blog Post 1"], titles)
+        self.assertEqual(second_page.next_cursor, response.context["page"].next_cursor)
+
+        response = self.client.get(
+            reverse("blog_index"), {"before": second_page.previous_cursor}
+        )
+        titles = [post.title for post in response.context["posts"]]
+        self.assertEqual(["Blog Post 4", "Blog Post 3"], titles)
+        self.assertFalse(response.context["page"].has_previous)
+
+    @override_settings(BLOG_PAGE_SIZE=2)
+    def test_pagination_query_count(self):
+        response = self.client.get(reverse("blog_index"))
+        cursor = response.context["page"].next_cursor
+
+        with self.assertNumQueries(2):
+            self.client.get(reverse("blog_index"), {"after": cursor})
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("blog_index"), {"after": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
 
 class BlogCategoryViewTest(TestCase):
     @classmethod
@@ -66,21 +144,70 @@ class BlogCategoryViewTest(TestCase):
 
     def test_view_url_exists_at_desired_location(self):
         cat = Category.objects.get(id=1)
-        response = self.client.get(f"/blog/{cat.name}/")
+        response = self.client.get(f"/blog/{cat.slug}/")
         self.assertEqual(response.status_code, 200)
 
     def test_view_url_accessible_by_name(self):
         cat = Category.objects.get(id=1)
-        response = self.client.get(reverse("blog_category", kwargs={"category": cat}))
+        response = self.client.get(
+            reverse("blog_category", kwargs={"category": cat.slug})
+        )
         self.assertEqual(response.status_code, 200)
 
     def test_view_uses_correct_template(self):
         cat = Category.objects.get(id=1)
-        response = self.client.get(reverse("blog_category", kwargs={"category": cat}))
+        response = self.client.get(
+            reverse("blog_category", kwargs={"category": cat.slug})
+        )
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "blog_category.html")
         self.assertTemplateUsed(response, "base.html")
 
+    def test_name_url_redirects_to_slug_url(self):
+        cat = Category.objects.get(id=1)
+        response = self.client.get(f"/blog/{cat.name}/", {"after": "abc"})
+        self.assertRedirects(
+            response,
+            f"/blog/{cat.slug}/?after=abc",
+            status_code=301,
+            fetch_redirect_response=False,
+        )
+
+    def test_unknown_category(self):
+        response = self.client.get("/blog/no-such-category/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_exact_category_match(self):
+        py = Category.objects.create(name="py")
+        python = Category.objects.create(name="Python")
+        Post.objects.create(title="Python Post").categories.add(python)
+        both = Post.objects.create(title="Both Post")
+        both.categories.add(py, python)
+
+        response = self.client.get(reverse("blog_category", kwargs={"category": "py"}))
+        self.assertEqual(["Both Post"], [p.title for p in response.context["posts"]])
+
+        response = self.client.get(
+            reverse("blog_category", kwargs={"category": "python"})
+        )
+        titles = [p.title for p in response.context["posts"]]
+        self.assertEqual(["Both Post", "Python Post"], titles)
+
+    def test_query_count_is_constant(self):
+        cat = Category.objects.get(id=1)
+        other = Category.objects.create(name="Other Category")
+        for i in range(10):
+            post = Post.objects.create(title=f"Blog Post {i}", body="body")
+            post.categories.set([cat, other])
+
+        # validators, the category, its posts and their categories
+        with self.assertNumQueries(4):
+            response = self.client.get(
+                reverse("blog_category", kwargs={"category": cat.slug})
+            )
+        self.assertEqual(len(response.context["posts"]), 10)
+        self.assertContains(response, "Other Category", count=10)
+
 
 class BlogDetailViewTest(TestCase):
     @classmethod
@@ -212,3 +339,210 @@ class BlogDetailViewTest(TestCase):
         self.assertEqual("Test this comment form", comment.body)
         self.assertIsInstance(comment.created_on, datetime)
         self.assertEqual("Blog Post 2", str(comment.post))
+
+
+class BlogSearchViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Post.objects.create(
+            title="Profiling Django",
+            body="Finding slow queries with <b>cProfile</b> and the debug toolbar.",
+        )
+        Post.objects.create(
+            title="Cooking",
+            body="Profiling is mentioned once in this post about bread.",
+        )
+        Post.objects.create(title="Unrelated", body="Nothing to see here.")
+
+    def test_view_url_exists_at_desired_location(self):
+        response = self.client.get("/blog/search/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_view_uses_correct_template(self):
+        response = self.client.get(reverse("blog_search"), {"q": "profiling"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "blog_search.html")
+        self.assertTemplateUsed(response, "base.html")
+
+    def test_results_are_ranked(self):
+        response = self.client.get(reverse("blog_search"), {"q": "profiling"})
+        titles = [post.title for post in response.context["posts"]]
+        self.assertEqual(["Profiling Django", "Cooking"], titles)
+
+    def test_snippet_is_highlighted_and_escaped(self):
+        response = self.client.get(reverse("blog_search"), {"q": "cprofile"})
+        self.assertContains(response, "&lt;b&gt;<mark>cProfile</mark>&lt;/b&gt;")
+
+    def test_query_syntax_is_ignored(self):
+        response = self.client.get(reverse("blog_search"), {"q": '(bread"*'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(["Cooking"], [p.title for p in response.context["posts"]])
+
+    def test_control_characters_are_ignored(self):
+        response = self.client.get(reverse("blog_search"), {"q": "bread\x00\x1f"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(["Cooking"], [p.title for p in response.context["posts"]])
+
+    def test_index_follows_edits_and_deletes(self):
+        post = Post.objects.get(title="Unrelated")
+        post.body = "Now about profiling too."
+        post.save()
+        response = self.client.get(reverse("blog_search"), {"q": "profiling"})
+        self.assertEqual(3, len(response.context["posts"]))
+
+        post.delete()
+        response = self.client.get(reverse("blog_search"), {"q": "profiling"})
+        self.assertEqual(2, len(response.context["posts"]))
+
+    def test_empty_query(self):
+        response = self.client.get(reverse("blog_search"), {"q": "  "})
+        self.assertEqual([], response.context["posts"])
+
+
+@override_settings(BLOG_COMMENTS_PAGE_SIZE=2)
+class BlogCommentsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = Post.objects.create(title="Popular Post", body="body")
+        cls.comments = [
+            Comment.objects.create(
+                author=f"Author {i}", body=f"Comment {i}", post=cls.post
+            )
+            for i in range(5)
+        ]
+
+    def test_detail_paginates_comments(self):
+        url = reverse("blog_detail", kwargs={"pk": self.post.pk})
+        response = self.client.get(url)
+        authors = [comment.author for comment in response.context["comments"]]
+        self.assertEqual(["Author 0", "Author 1"], authors)
+
+        page = response.context["comments_page"]
+        response = self.client.get(url, {"after": page.next_cursor})
+        authors = [comment.author for comment in response.context["comments"]]
+        self.assertEqual(["Author 2", "Author 3"], authors)
+        self.assertTrue(response.context["comments_page"].has_previous)
+
+    def test_detail_query_count_is_constant(self):
+        cache.clear()
+        url = reverse("blog_detail", kwargs={"pk": self.post.pk})
+        # validators, the post, its categories and one page of comments
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+        for i in range(20):
+            Comment.objects.create(author="More", body="More", post=self.post)
+
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+    def test_comments_since_as_json(self):
+        url = reverse("blog_comments", kwargs={"pk": self.post.pk})
+        response = self.client.get(url, {"since": self.comments[1].pk})
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()
+        self.assertEqual(
+            ["Comment 2", "Comment 3"], [c["body"] for c in data["comments"]]
+        )
+        self.assertEqual(self.comments[3].pk, data["last_id"])
+        self.assertTrue(data["has_more"])
+
+        response = self.client.get(url, {"since": data["last_id"]})
+        data = response.json()
+        self.assertEqual(["Comment 4"], [c["body"] for c in data["comments"]])
+        self.assertFalse(data["has_more"])
+
+        response = self.client.get(url, {"since": data["last_id"]})
+        data = response.json()
+        self.assertEqual([], data["comments"])
+        self.assertEqual(self.comments[4].pk, data["last_id"])
+
+    def test_comments_since_a_missing_comment(self):
+        url = reverse("blog_comments", kwargs={"pk": self.post.pk})
+        other = Post.objects.create(title="Other", body="body")
+        elsewhere = Comment.objects.create(
+            author="Else", body="Where", post=other, created_on=self.post.created_on
+        )
+        deleted = self.comments[1].pk
+        Comment.objects.filter(pk=deleted).delete()
+
+        response = self.client.get(url, {"since": deleted})
+        bodies = [c["body"] for c in response.json()["comments"]]
+        self.assertEqual(["Comment 2", "Comment 3"], bodies)
+
+        # not one of the post's comments, so its time isn't used
+        response = self.client.get(url, {"since": elsewhere.pk})
+        self.assertEqual([], response.json()["comments"])
+
+    def test_comments_as_html_fragment(self):
+        url = reverse("blog_comments", kwargs={"pk": self.post.pk})
+        response = self.client.get(url, {"format": "html"})
+        self.assertTemplateUsed(response, "_comments.html")
+        self.assertTemplateNotUsed(response, "base.html")
+        self.assertContains(response, "Author 1")
+        self.assertNotContains(response, "Author 2")
+
+    def test_comments_invalid_requests(self):
+        url = reverse("blog_comments", kwargs={"pk": self.post.pk})
+        for since in ["x", "²", str(2**63)]:
+            response = self.client.get(url, {"since": since})
+            self.assertEqual(404, response.status_code, since)
+        url = reverse("blog_comments", kwargs={"pk": self.post.pk + 1})
+        self.assertEqual(404, self.client.get(url).status_code)
+
+
+class CategoryLinksTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.django = Category.objects.create(name="Django")
+        cls.python = Category.objects.create(name="Python")
+        cls.post = Post.objects.create(title="Blog Post", body="body")
+        cls.post.categories.add(cls.django)
+
+    def setUp(self):
+        cache.clear()
+        caches["fragments"].clear()
+
+    def test_links_use_prefetched_categories(self):
+        for i in range(5):
+            Post.objects.create(title=f"Post {i}", body="body").categories.add(
+                self.python
+            )
+        # the posts and all of their categories
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("blog_index"))
+        self.assertContains(response, f'href="/blog/{self.python.slug}/"', count=5)
+
+    def test_links_are_cached(self):
+        for i in range(5):
+            Post.objects.create(title=f"Post {i}", body="body").categories.add(
+                self.python
+            )
+        url = reverse("blog_index")
+        with mock.patch(
+            "blog.templatetags.blog_tags.render_to_string", wraps=render_to_string
+        ) as render:
+            self.client.get(url)
+            # one fragment for the post in Django, one shared by those in Python
+            self.assertEqual(2, render.call_count)
+            response = self.client.get(url)
+            self.assertEqual(2, render.call_count)
+        self.assertContains(response, f'href="/blog/{self.python.slug}/"', count=5)
+
+    def test_links_follow_category_changes(self):
+        url = reverse("blog_index")
+        self.assertContains(self.client.get(url), "Django")
+
+        self.post.categories.add(self.python)
+        self.assertContains(self.client.get(url), "Python")
+
+        self.django.name = "Web"
+        self.django.save()
+        response = self.client.get(url)
+        self.assertContains(response, "Web")
+        self.assertNotContains(response, "Django")
+
+        self.post.categories.clear()
+        response = self.client.get(url)
+        self.assertNotContains(response, "Python")
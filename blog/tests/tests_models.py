@@ -19,6 +19,30 @@ class CategoryModelTest(TestCase):
         expected_object_name = f"{c.name}"
         self.assertEqual(expected_object_name, str(c))
 
+    def test_slug_generated_from_name(self):
+        c = Category.objects.create(name="Web Development")
+        self.assertEqual("web-development", c.slug)
+
+    def test_slug_is_unique(self):
+        slug = Category._meta.get_field("slug")
+        self.assertTrue(slug.unique)
+        self.assertTrue(slug.db_index)
+
+    def test_clashing_slug_gets_pk(self):
+        Category.objects.create(name="C")
+        c = Category.objects.create(name="C#")
+        self.assertEqual(f"c-{c.pk}", c.slug)
+
+    def test_empty_slug_falls_back_to_pk(self):
+        c = Category.objects.create(name="++")
+        self.assertEqual(f"category-{c.pk}", c.slug)
+
+    def test_reserved_slugs(self):
+        for name in ["Search", "Feed", "2021"]:
+            c = Category.objects.create(name=name)
+            self.assertEqual(f"{name.lower()}-{c.pk}", c.slug)
+            self.assertEqual(f"/blog/{c.slug}/", c.get_absolute_url())
+
 
 class CommentModelTest(TestCase):
     @classmethod
@@ -76,3 +100,22 @@ class PostModelTest(TestCase):
         c = Post.objects.get(id=1)
         expected_object_name = f"{c.title}"
         self.assertEqual(expected_object_name, str(c))
+
+    def test_rendered_fields_updated_on_save(self):
+        p = Post.objects.get(id=1)
+        p.body = "<b>Hello</b>\n\nWorld" + "!" * 500
+        p.save()
+
+        p.refresh_from_db()
+        self.assertEqual(400, len(p.excerpt))
+        self.assertTrue(p.excerpt.startswith("<b>Hello</b>"))
+        self.assertTrue(p.body_html.startswith("<p>&lt;b&gt;Hello&lt;/b&gt;</p>"))
+
+    def test_rendered_fields_saved_with_update_fields(self):
+        p = Post.objects.get(id=1)
+        p.body = "Updated"
+        p.save(update_fields=["body"])
+
+        p.refresh_from_db()
+        self.assertEqual("Updated", p.excerpt)
+        self.assertEqual("<p>Updated</p>", p.body_html)
@@ -4,6 +4,14 @@ from . import views
 
 urlpatterns = [
     path("", views.blog_index, name="blog_index"),
+    path("search/", views.blog_search, name="blog_search"),
+    path("feed/<feed_format>/", views.blog_feed, name="blog_feed"),
     path("<int:pk>/", views.blog_detail, name="blog_detail"),
+    path("<int:pk>/comments/", views.blog_comments, name="blog_comments"),
     path("<category>/", views.blog_category, name="blog_category"),
+    path(
+        "<category>/feed/<feed_format>/",
+        views.blog_feed,
+        name="blog_category_feed",
+    ),
 ]
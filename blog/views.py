@@ -1,26 +1,142 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.db.models import Count, Max
+from django.db.models.functions import Greatest
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from personal_portfolio.cache import cached_page, tags_last_modified
+from personal_portfolio.conditional import conditional_page
 
-from blog.models import Comment, Post
+from blog.models import Category, Comment, Post
 
+from . import feeds, search, spool
 from .forms import CommentForm
+from .pagination import keyset_paginate
 
+# the largest id SQLite can store
+MAX_ID = 2**63 - 1
 
+# the cursors read by keyset_paginate
+PAGE_PARAMS = ("after", "before")
+
+
+def _page_size():
+    return getattr(settings, "BLOG_PAGE_SIZE", 10)
+
+
+def _comments_page_size():
+    return getattr(settings, "BLOG_COMMENTS_PAGE_SIZE", 50)
+
+
+def _index_validators(request):
+    # posts, categories and the links between them all bump the posts tag,
+    # which conditional_page adds to the ETag
+    return "posts", tags_last_modified(["posts"])
+
+
+def _category_validators(request, category):
+    if not Category.objects.filter(slug=category).exists():
+        # answered with a redirect or a 404
+        return None
+    return _index_validators(request)
+
+
+def _feed_validators(request, feed_format, category=None):
+    if category is None:
+        return _index_validators(request)
+    return _category_validators(request, category)
+
+
+def _detail_validators(request, pk):
+    rows = (
+        Post.objects.filter(pk=pk)
+        .values("pk", "last_modified")
+        .annotate(
+            latest_comment=Max("comment__id"),
+            comment_count=Count("comment"),
+            updated=Greatest("last_modified", Max("comment__created_on")),
+        )
+        .order_by()
+    )
+    if not rows:
+        return None
+    stats = rows[0]
+    version = (
+        f"{stats['last_modified']}|{stats['latest_comment']}|{stats['comment_count']}"
+    )
+    pending = spool.pending_ids(request, pk)
+    if pending:
+        # so the author doesn't get a 304 for a page without their comment
+        version = f"{version}|{','.join(pending)}"
+    return version, stats["updated"] or stats["last_modified"]
+
+
+@conditional_page(_index_validators, "posts")
+@cached_page("posts", params=PAGE_PARAMS)
 def blog_index(request):
-    posts = Post.objects.all().order_by("-created_on")
+    page = keyset_paginate(Post.objects.listing(), request.GET, _page_size())
     context = {
-        "posts": posts,
+        "posts": page.object_list,
+        "page": page,
     }
     return render(request, "blog_index.html", context)
 
 
+@conditional_page(_category_validators, "posts")
+@cached_page("posts", params=PAGE_PARAMS)
 def blog_category(request, category):
-    posts = Post.objects.filter(categories__name__contains=category).order_by(
-        "-created_on"
-    )
-    context = {"category": category, "posts": posts}
+    try:
+        category = Category.objects.get(slug=category)
+    except Category.DoesNotExist:
+        return _redirect_category_name(request, category, "blog_category")
+
+    posts = Post.objects.listing().filter(categories=category)
+    page = keyset_paginate(posts, request.GET, _page_size())
+    context = {"category": category, "posts": page.object_list, "page": page}
     return render(request, "blog_category.html", context)
 
 
+def _redirect_category_name(request, name, url_name, **kwargs):
+    """Send links made before categories had slugs on to the slug URL."""
+    category = Category.objects.filter(name=name).first()
+    if category is None:
+        raise Http404("No such category")
+    url = reverse(url_name, kwargs={"category": category.slug, **kwargs})
+    if request.GET:
+        url = f"{url}?{request.GET.urlencode()}"
+    return redirect(url, permanent=True)
+
+
+# comments aren't in the feeds, so unlike the post pages they're only
+# rendered again after a post or category changes
+@conditional_page(_feed_validators, "posts")
+@cached_page("posts")
+def blog_feed(request, feed_format, category=None):
+    if feed_format not in feeds.FEEDS:
+        raise Http404("No such feed")
+    try:
+        response = feeds.FEEDS[feed_format](request, category=category)
+    except Http404:
+        if category is None:
+            raise
+        return _redirect_category_name(
+            request, category, "blog_category_feed", feed_format=feed_format
+        )
+    # the newest post's date doesn't move when a post is deleted, so leave
+    # Last-Modified to the validators
+    del response["Last-Modified"]
+    return response
+
+
+def blog_search(request):
+    query = request.GET.get("q", "").strip()
+    posts = search.search_posts(query) if query else []
+    context = {"query": query, "posts": posts}
+    return render(request, "blog_search.html", context)
+
+
+@conditional_page(_detail_validators, "post:{pk}")
+@cached_page("post:{pk}", params=PAGE_PARAMS, bypass=spool.has_pending)
 def blog_detail(request, pk):
     post = Post.objects.get(pk=pk)
 
@@ -28,17 +144,71 @@ def blog_detail(request, pk):
     if request.method == "POST":
         form = CommentForm(request.POST)
         if form.is_valid():
-            comment = Comment(
-                author=form.cleaned_data["author"],
-                body=form.cleaned_data["body"],
-                post=post,
-            )
-            comment.save()
+            author = form.cleaned_data["author"]
+            body = form.cleaned_data["body"]
+            if spool.enabled():
+                spool.enqueue(request, post, author, body)
+            else:
+                Comment.objects.create(author=author, body=body, post=post)
 
-    comments = Comment.objects.filter(post=post)
+    comments = keyset_paginate(
+        Comment.objects.filter(post=post),
+        request.GET,
+        _comments_page_size(),
+        descending=False,
+    )
+    object_list = comments.object_list
+    # looked up on every page, so flushed comments leave the cookie
+    pending = spool.pending_comments(request, post.pk)
+    if not comments.has_next:
+        object_list = object_list + pending
     context = {
         "post": post,
-        "comments": comments,
+        "comments": object_list,
+        "comments_page": comments,
         "form": form,
     }
-    return render(request, "blog_detail.html", context)
+    response = render(request, "blog_detail.html", context)
+    spool.update_cookie(request, response)
+    return response
+
+
+@conditional_page(_detail_validators, "post:{pk}")
+@cached_page("post:{pk}", params=("since", "format"))
+def blog_comments(request, pk):
+    """Comments posted after the ``since`` comment id, as JSON or HTML."""
+    post = get_object_or_404(Post.objects.only("id"), pk=pk)
+    comments = Comment.objects.filter(post=post)
+    since = request.GET.get("since")
+    if since is None:
+        comments = comments.order_by("created_on", "pk")
+    # isdigit() alone also takes digits like "²" that int() doesn't, and
+    # SQLite integers are 64-bit
+    elif since.isascii() and since.isdigit() and int(since) <= MAX_ID:
+        since = int(since)
+        comments = comments.since(since)
+    else:
+        raise Http404("Invalid comment id")
+
+    limit = _comments_page_size()
+    comments = list(comments[: limit + 1])
+    has_more = len(comments) > limit
+    comments = comments[:limit]
+
+    if request.GET.get("format") == "html":
+        return render(request, "_comments.html", {"comments": comments})
+    return JsonResponse(
+        {
+            "comments": [
+                {
+                    "id": comment.pk,
+                    "author": comment.author,
+                    "body": comment.body,
+                    "created_on": comment.created_on.isoformat(),
+                }
+                for comment in comments
+            ],
+            "last_id": comments[-1].pk if comments else since,
+            "has_more": has_more,
+        }
+    )
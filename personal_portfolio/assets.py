@@ -0,0 +1,201 @@
+"""Build the site's CSS and JavaScript bundles.
+
+Bootstrap's stylesheet, which base.html used to load from a CDN, is kept in
+``assets/vendor``, pinned by its subresource integrity hash. The
+``build_assets`` command drops the rules whose classes appear nowhere in
+the templates or code. The rules the navbar and the cards need to render
+are also written out to be inlined into each page, so first paint doesn't
+wait for the stylesheet.
+
+The only script the pages need opens the navbar on small screens, so it's
+written by hand in ``assets/navbar.js`` rather than loading jQuery and
+Bootstrap's JavaScript for it.
+"""
+
+import base64
+import hashlib
+import re
+
+from django.conf import settings
+
+ASSETS_DIR = settings.BASE_DIR / "personal_portfolio" / "assets" / "vendor"
+SCRIPT = settings.BASE_DIR / "personal_portfolio" / "assets" / "navbar.js"
+BUNDLE_DIR = settings.BASE_DIR / "personal_portfolio" / "static" / "bundle"
+CRITICAL_CSS = settings.BASE_DIR / "personal_portfolio" / "templates" / "_critical.css"
+
+# name, where it was vendored from and its subresource integrity hash
+VENDOR = (
+    (
+        "bootstrap.min.css",
+        "https://stackpath.bootstrapcdn.com/bootstrap/4.1.3/css/bootstrap.min.css",
+        "sha384-MCw98/SFnGE8fJT3GXwEOngsV7Zt27NXFoaoApmYm81iuXoPkFOJwJ8ERdknLPMO",
+    ),
+)
+
+# where the build looks for the class names in use
+SOURCE_PATTERNS = ("*/templates/**/*.html", "*/*.py", "*/templatetags/*.py")
+
+# classes only ever added by navbar.js
+SAFELIST = {"show"}
+
+# the navbar and the cards, which are drawn before the stylesheet arrives
+CRITICAL_PREFIXES = (
+    "navbar",
+    "nav",
+    "bg-light",
+    "collapse",
+    "show",
+    "container",
+    "card",
+)
+CRITICAL_ELEMENTS = {"*", "::after", "::before", "html", "body"}
+
+NESTING_AT_RULES = ("@media", "@supports", "@document")
+
+_CLASS = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+_WORD = re.compile(r"[\w-]+")
+
+
+def integrity(content):
+    digest = hashlib.sha384(content).digest()
+    return f"sha384-{base64.b64encode(digest).decode()}"
+
+
+def used_classes(base_dir):
+    """Every word in the project's templates and code, a superset of its classes."""
+    words = set(SAFELIST)
+    for pattern in SOURCE_PATTERNS:
+        for path in base_dir.glob(pattern):
+            words.update(_WORD.findall(path.read_text(errors="ignore")))
+    return words
+
+
+def minify_js(source):
+    """Drop the indentation, blank lines and comment lines of ``source``.
+
+    Enough for navbar.js, which keeps comments on lines of their own and
+    ends its statements with semicolons.
+    """
+    lines = (line.strip() for line in source.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def _skip(css, pos, stop):
+    """Find the first of ``stop`` from ``pos``, skipping strings and comments."""
+    while pos < len(css):
+        char = css[pos]
+        if css.startswith("/*", pos):
+            pos = css.index("*/", pos + 2) + 2
+            continue
+        if char in "\"'":
+            pos = css.index(char, pos + 1) + 1
+            continue
+        if char in stop:
+            return pos
+        pos += 1
+    return pos
+
+
+def _matching_brace(css, pos):
+    depth = 0
+    while True:
+        pos = _skip(css, pos, "{}")
+        depth += 1 if css[pos] == "{" else -1
+        if depth == 0:
+            return pos
+        pos += 1
+
+
+def parse(css, pos=0):
+    """Split a stylesheet into ``(prelude, body)`` rules.
+
+    The body of an ``@media`` or similar rule is a list of rules, other
+    bodies are left as text. Returns the rules and where parsing stopped.
+    """
+    rules = []
+    while True:
+        while pos < len(css) and css[pos].isspace():
+            pos += 1
+        if css.startswith("/*", pos):
+            end = css.index("*/", pos) + 2
+            # keep license comments
+            if css.startswith("/*!", pos):
+                rules.append((css[pos:end], None))
+            pos = end
+            continue
+        if pos >= len(css) or css[pos] == "}":
+            return rules, pos
+
+        brace = _skip(css, pos, "{;}")
+        prelude = css[pos:brace].strip()
+        if brace >= len(css) or css[brace] != "{":
+            # a statement like @charset, or the end of the stylesheet
+            rules.append((prelude + ";", None))
+            pos = brace + 1
+        elif prelude.startswith(NESTING_AT_RULES):
+            children, end = parse(css, brace + 1)
+            rules.append((prelude, children))
+            pos = end + 1
+        else:
+            end = _matching_brace(css, brace)
+            rules.append((prelude, css[brace + 1 : end]))
+            pos = end + 1
+
+
+def serialize(rules):
+    parts = []
+    for prelude, body in rules:
+        if body is None:
+            parts.append(prelude)
+        elif isinstance(body, list):
+            parts.append(f"{prelude}{{{serialize(body)}}}")
+        else:
+            parts.append(f"{prelude}{{{body}}}")
+    return "".join(parts)
+
+
+def _filter(rules, keep_selector):
+    kept = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            children = _filter(body, keep_selector)
+            if children:
+                kept.append((prelude, children))
+        elif body is None or prelude.startswith("@"):
+            kept.append((prelude, body))
+        else:
+            selectors = [s for s in prelude.split(",") if keep_selector(s.strip())]
+            if selectors:
+                kept.append((",".join(selectors), body))
+    return kept
+
+
+def purge(css, used):
+    """Drop the selectors using classes that aren't in ``used``."""
+    rules, _ = parse(css)
+    return serialize(
+        _filter(rules, lambda selector: set(_CLASS.findall(selector)) <= used)
+    )
+
+
+def critical(css):
+    """The rules for the ``CRITICAL_ELEMENTS`` and ``CRITICAL_PREFIXES`` classes.
+
+    ``css`` should be purged first. At-rules like ``@font-face``, print
+    styles and comments are left to the full stylesheet.
+    """
+
+    def keep_selector(selector):
+        classes = _CLASS.findall(selector)
+        if not classes:
+            return selector in CRITICAL_ELEMENTS
+        return all(c.startswith(CRITICAL_PREFIXES) for c in classes)
+
+    rules, _ = parse(css)
+    rules = [
+        (prelude, body)
+        for prelude, body in rules
+        if not prelude.startswith(("@media print", "/*"))
+        and (isinstance(body, list) or not prelude.startswith("@"))
+    ]
+    return serialize(_filter(rules, keep_selector))
@@ -0,0 +1,9 @@
+// Bootstrap's collapse for the navbar toggler, which is all the JavaScript
+// the pages used jQuery and Bootstrap's scripts for
+document.querySelectorAll('[data-toggle="collapse"]').forEach(function (toggler) {
+    var target = document.querySelector(toggler.getAttribute("data-target"));
+    toggler.addEventListener("click", function () {
+        var shown = target.classList.toggle("show");
+        toggler.setAttribute("aria-expanded", String(shown));
+    });
+});
@@ -0,0 +1,102 @@
+"""Performance budgets for each page, keyed by URL name.
+
+``queries`` is the most database queries one request may run, whatever
+the amount of data. ``ms`` is the median render time allowed with the
+``VOLUME`` of seeded data used by ``personal_portfolio.tests.test_budgets``,
+which only checks it when the ``CHECK_RENDER_TIME`` environment variable
+is 1.
+
+Query budgets are enforced on every request made by the test suite:
+``BudgetTestRunner`` adds ``QueryBudgetMiddleware`` to the middleware, so a
+view test that trips over an N+1 fails even if it only checks a status code.
+"""
+
+from collections import namedtuple
+
+from django.test.runner import DiscoverRunner
+
+Budget = namedtuple("Budget", ["queries", "ms"])
+
+BUDGETS = {
+    "home": Budget(queries=2, ms=50),
+    "project_detail": Budget(queries=2, ms=50),
+    "blog_index": Budget(queries=2, ms=100),
+    "blog_category": Budget(queries=4, ms=150),
+    "blog_search": Budget(queries=3, ms=150),
+    # a comment POST adds the insert to the page's own queries
+    "blog_detail": Budget(queries=5, ms=150),
+    "blog_comments": Budget(queries=3, ms=100),
+    "blog_feed": Budget(queries=2, ms=100),
+    "blog_category_feed": Budget(queries=4, ms=100),
+    "cv": Budget(queries=0, ms=50),
+    "sitemap_index": Budget(queries=2, ms=100),
+    "sitemap_pages": Budget(queries=3, ms=100),
+    "sitemap_posts": Budget(queries=1, ms=100),
+}
+
+VOLUME = {
+    "posts": 2000,
+    "categories": 20,
+    "comments": 20000,
+    "projects": 20,
+}
+
+
+class BudgetExceeded(AssertionError):
+    pass
+
+
+class QueryBudgetMiddleware:
+    """Fail requests whose view runs more queries than its page's budget.
+
+    Queries made by other middleware before the view, like loading the
+    session or user, don't count. Must come before
+    ``ServerTimingMiddleware``, whose timer counts the queries.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        budget = getattr(request, "query_budget", None)
+        # a view that raised should fail with its own error, not the budget
+        if budget is not None and response.status_code < 500:
+            url_name, limit, start = budget
+            count = request.server_timing.query_count - start
+            if count > limit:
+                raise BudgetExceeded(
+                    f"{request.method} {request.get_full_path()} ran {count} "
+                    f"queries, the {url_name} budget is {limit}"
+                )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        url_name = request.resolver_match.url_name
+        timer = getattr(request, "server_timing", None)
+        if url_name in BUDGETS and timer is not None:
+            request.query_budget = (
+                url_name,
+                BUDGETS[url_name].queries,
+                timer.query_count,
+            )
+
+
+class BudgetTestRunner(DiscoverRunner):
+    """The default test runner, enforcing query budgets on every request."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        from django.conf import settings
+
+        self._middleware = settings.MIDDLEWARE
+        settings.MIDDLEWARE = [
+            "personal_portfolio.budgets.QueryBudgetMiddleware",
+            *settings.MIDDLEWARE,
+        ]
+
+    def teardown_test_environment(self, **kwargs):
+        from django.conf import settings
+
+        settings.MIDDLEWARE = self._middleware
+        super().teardown_test_environment(**kwargs)
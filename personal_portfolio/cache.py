@@ -0,0 +1,146 @@
+"""Whole-page caching with tag-based invalidation.
+
+Views decorated with ``cached_page`` store their rendered response under a
+key built from the request's origin and path, the query parameters the view
+reads and the current version of each of the view's tags. Model signal
+handlers call ``invalidate`` with the tags a change affects, which bumps
+those versions so only the pages depending on them miss the cache on their
+next request.
+"""
+
+import hashlib
+import re
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.http import urlencode
+
+from personal_portfolio.routers import use_primary
+
+DEFAULT_TIMEOUT = 60 * 60 * 24
+
+# a cached page is shared between visitors, so the CSRF token rendered into
+# it is swapped for the current visitor's token when the page is served
+_CSRF_VALUE = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+_CSRF_PLACEHOLDER = rb"\1__csrf_token__\2"
+
+
+def _tag_key(tag):
+    return f"page-tag:{tag}"
+
+
+def tag_versions(tags):
+    """Return the current version of each tag, creating missing ones."""
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # start from the clock rather than 0 so an evicted version can't
+            # come back as a value that matches a stale page
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*tags):
+    for tag in tags:
+        key = _tag_key(tag)
+        # the time of the change, so versions can be used as Last-Modified
+        version = cache.get(key) or 0
+        cache.set(key, max(time.time_ns(), version + 1), None)
+
+
+def tags_last_modified(tags):
+    """When the pages under ``tags`` last changed, or None if too recently.
+
+    HTTP dates are in whole seconds, so a page changed in the second it
+    was sent would carry the same Last-Modified as before the change.
+    """
+    version = max(tag_versions(tags)) / 1e9
+    if time.time() - version < 1:
+        return None
+    return datetime.fromtimestamp(version, tz=timezone.utc)
+
+
+def _page_key(request, versions):
+    versions = ".".join(str(version) for version in versions)
+    # sorted so the order of the parameters in the URL doesn't matter
+    query = urlencode(sorted((name, request.GET[name]) for name in request.GET))
+    # feeds and sitemaps hold absolute URLs
+    url = f"{request.scheme}://{request.get_host()}{request.path}?{query}"
+    digest = hashlib.md5(f"{url}|{versions}".encode()).hexdigest()
+    return f"page:{digest}"
+
+
+def _changed_within_pin(versions):
+    """Whether a tag changed too recently for the replica to have caught up.
+
+    Versions are the time of the change, see ``invalidate``.
+    """
+    pin = getattr(settings, "REPLICA_PIN_SECONDS", 10)
+    return time.time_ns() - max(versions, default=0) < pin * 10**9
+
+
+def _freeze(response):
+    content, csrf_count = _CSRF_VALUE.subn(_CSRF_PLACEHOLDER, response.content)
+    return content, list(response.items()), bool(csrf_count)
+
+
+def _thaw(request, frozen):
+    content, headers, uses_csrf = frozen
+    if uses_csrf:
+        content = content.replace(b"__csrf_token__", get_token(request).encode())
+    response = HttpResponse(content)
+    for name, value in headers:
+        response[name] = value
+    return response
+
+
+def cached_page(*tags, params=(), bypass=None):
+    """Cache successful GET responses of a view under ``tags``.
+
+    Tags are formatted with the view's keyword arguments, so
+    ``cached_page("post:{pk}")`` gives each post its own tag. ``params`` are
+    the query parameters the view reads; a request with any other skips the
+    cache, so made-up query strings can't fill it. ``bypass`` is an optional
+    callable taking the request which skips the cache when it returns true.
+    Caching is switched on by the ``PAGE_CACHE`` setting.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                not getattr(settings, "PAGE_CACHE", False)
+                or request.method not in ("GET", "HEAD")
+                or not set(request.GET) <= set(params)
+                or (bypass is not None and bypass(request))
+            ):
+                return view(request, *args, **kwargs)
+
+            versions = tag_versions([tag.format(**kwargs) for tag in tags])
+            key = _page_key(request, versions)
+            frozen = cache.get(key)
+            if frozen is not None:
+                return _thaw(request, frozen)
+
+            if _changed_within_pin(versions):
+                # a lagging replica may not have the change yet, and the page
+                # would be cached under the new tag versions and stay stale
+                with use_primary():
+                    response = view(request, *args, **kwargs)
+            else:
+                response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                timeout = getattr(settings, "PAGE_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+                cache.set(key, _freeze(response), timeout)
+            return response
+
+        return wrapper
+
+    return decorator
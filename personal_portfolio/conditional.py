@@ -0,0 +1,43 @@
+"""Conditional GET support for views whose content comes from the database.
+
+``conditional_page`` wraps Django's ``condition`` decorator so that a view
+only has to provide one cheap validator query. Requests carrying a
+matching ``If-None-Match`` or ``If-Modified-Since`` get a 304 before the
+view runs or any template is rendered.
+"""
+
+import hashlib
+
+from django.views.decorators.http import condition
+
+from personal_portfolio.cache import tag_versions
+
+
+def conditional_page(validators, *tags):
+    """Answer conditional requests using ``validators(request, **kwargs)``.
+
+    ``validators`` returns a ``(version, last_modified)`` pair, or None when
+    there is nothing to validate against. The ETag combines the version
+    with the request path and the page cache ``tags``, so changes that
+    don't touch a timestamp, like renaming a category, still change it.
+    """
+
+    def get_validators(request, kwargs):
+        if not hasattr(request, "_page_validators"):
+            request._page_validators = validators(request, **kwargs)
+        return request._page_validators
+
+    def etag(request, *args, **kwargs):
+        result = get_validators(request, kwargs)
+        if result is None:
+            return None
+        version = result[0]
+        versions = tag_versions([tag.format(**kwargs) for tag in tags])
+        value = f"{request.get_full_path()}|{version}|{versions}"
+        return hashlib.md5(value.encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        result = get_validators(request, kwargs)
+        return None if result is None else result[1]
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
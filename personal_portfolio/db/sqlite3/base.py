@@ -0,0 +1,98 @@
+"""SQLite backend tuned for several processes reading and writing at once.
+
+On top of Django's own SQLite backend, ``OPTIONS`` takes:
+
+* ``pragmas``: a dict of pragmas run on every new connection, e.g.
+  ``{"journal_mode": "WAL", "synchronous": "NORMAL"}``. In WAL mode readers
+  don't block the writer, nor the writer the readers.
+* ``transaction_mode``: how ``atomic`` blocks start their transaction, e.g.
+  ``"IMMEDIATE"``. A transaction which reads before it writes otherwise
+  fails with "database is locked" when another connection is writing,
+  without waiting out the busy ``timeout``.
+* ``retries`` and ``retry_backoff``: how many times, and after how many
+  seconds doubling each time, to retry a statement that still found the
+  database locked after the busy ``timeout``. Only statements that run
+  outside a transaction, or begin one, are retried, as a failed statement
+  in the middle of a transaction can't be retried on its own.
+"""
+
+import random
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+from django.db.backends.sqlite3.base import Database
+
+PRAGMAS = {
+    "journal_mode",
+    "synchronous",
+    "mmap_size",
+    "cache_size",
+    "temp_store",
+    "busy_timeout",
+    "wal_autocheckpoint",
+}
+
+
+def _is_locked(exc):
+    return "database is locked" in str(exc) or "database table is locked" in str(exc)
+
+
+class SQLiteCursorWrapper(base.SQLiteCursorWrapper):
+    db = None
+
+    def execute(self, query, params=None):
+        return self._retry(super().execute, query, params)
+
+    def executemany(self, query, param_list):
+        return self._retry(super().executemany, query, param_list)
+
+    def _retry(self, execute, query, params):
+        retries, backoff = self.db.retries, self.db.retry_backoff
+        for attempt in range(retries + 1):
+            try:
+                return execute(query, params)
+            except Database.OperationalError as exc:
+                # BEGIN runs before the atomic block is entered
+                if attempt == retries or not _is_locked(exc) or self.db.in_atomic_block:
+                    raise
+            # full jitter, so writers that collided don't collide again
+            time.sleep(random.uniform(0, backoff * 2**attempt))
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        options = self.settings_dict["OPTIONS"]
+        self.pragmas = options.get("pragmas", {})
+        unknown = set(self.pragmas) - PRAGMAS
+        if unknown:
+            raise ImproperlyConfigured(f"Unsupported SQLite pragmas: {sorted(unknown)}")
+        self.transaction_mode = mode = options.get("transaction_mode")
+        if mode not in (None, "DEFERRED", "IMMEDIATE", "EXCLUSIVE"):
+            raise ImproperlyConfigured(f"Invalid SQLite transaction_mode: {mode}")
+        self.retries = options.get("retries", 0)
+        self.retry_backoff = options.get("retry_backoff", 0.05)
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for option in ("pragmas", "transaction_mode", "retries", "retry_backoff"):
+            params.pop(option, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for pragma, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        return conn
+
+    def create_cursor(self, name=None):
+        cursor = self.connection.cursor(factory=SQLiteCursorWrapper)
+        cursor.db = self
+        return cursor
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode is None:
+            super()._start_transaction_under_autocommit()
+        else:
+            self.cursor().execute(f"BEGIN {self.transaction_mode}")
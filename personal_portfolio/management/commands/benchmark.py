@@ -0,0 +1,144 @@
+import json
+import math
+import subprocess
+import time
+import tracemalloc
+
+from blog.models import Category, Comment, Post
+from blog.pagination import encode_cursor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from projects.models import Project
+
+
+def percentile(timings, pct):
+    """Nearest-rank percentile of a sorted list."""
+    index = max(0, math.ceil(pct / 100 * len(timings)) - 1)
+    return timings[index]
+
+
+class Command(BaseCommand):
+    help = "Time every page of the site and report latency, queries and memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--page-cache",
+            action="store_true",
+            help="Leave PAGE_CACHE as configured instead of switching it off.",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args, **options):
+        page_cache = getattr(settings, "PAGE_CACHE", False) and options["page_cache"]
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            PAGE_CACHE=page_cache,
+        ):
+            client = Client()
+            results = {
+                name: self.measure(client, url, options["requests"], options["warmup"])
+                for name, url in self.urls().items()
+            }
+
+        report = {
+            "commit": self.commit(),
+            "timestamp": timezone.now().isoformat(),
+            "page_cache": page_cache,
+            "rows": {
+                "posts": Post.objects.count(),
+                "categories": Category.objects.count(),
+                "comments": Comment.objects.count(),
+                "projects": Project.objects.count(),
+            },
+            "results": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output)
+        self.stdout.write(output)
+
+    def urls(self):
+        urls = {
+            "blog_index": reverse("blog_index"),
+            "project_index": reverse("home"),
+            "cv": reverse("cv"),
+        }
+        page_size = getattr(settings, "BLOG_PAGE_SIZE", 10)
+        last_on_first_page = Post.objects.listing()[page_size - 1 : page_size]
+        for post in last_on_first_page:
+            cursor = encode_cursor(post)
+            urls["blog_index_page_2"] = f"{urls['blog_index']}?after={cursor}"
+
+        category = (
+            Category.objects.annotate(size=Count("posts")).order_by("-size").first()
+        )
+        if category is not None:
+            urls["blog_category"] = reverse(
+                "blog_category", kwargs={"category": category.slug}
+            )
+        post = Post.objects.annotate(size=Count("comment")).order_by("-size").first()
+        if post is not None:
+            urls["blog_detail"] = reverse("blog_detail", kwargs={"pk": post.pk})
+            urls["blog_search"] = f"{reverse('blog_search')}?q={post.title.split()[0]}"
+        project = Project.objects.first()
+        if project is not None:
+            urls["project_detail"] = reverse(
+                "project_detail", kwargs={"pk": project.pk}
+            )
+        return urls
+
+    def measure(self, client, url, requests, warmup):
+        for _ in range(warmup):
+            client.get(url)
+
+        # queries and memory come from a separate request, as tracing them
+        # would distort the timings
+        reset_queries()
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        query_count = len(queries)
+
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+
+        return {
+            "url": url,
+            "status": response.status_code,
+            "bytes": len(response.content),
+            "queries": query_count,
+            "peak_memory_kb": round(peak_memory / 1024, 1),
+            "mean_ms": round(sum(timings) / len(timings), 3),
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "p99_ms": round(percentile(timings, 99), 3),
+        }
+
+    def commit(self):
+        try:
+            return (
+                subprocess.run(
+                    ["git", "rev-parse", "--short", "HEAD"],
+                    capture_output=True,
+                    text=True,
+                    cwd=settings.BASE_DIR,
+                ).stdout.strip()
+                or None
+            )
+        except OSError:
+            return None
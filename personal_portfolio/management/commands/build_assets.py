@@ -0,0 +1,57 @@
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from personal_portfolio import assets
+
+
+class Command(BaseCommand):
+    help = (
+        "Check the vendored stylesheet against its integrity hash and build "
+        "the site's script, stylesheet and critical CSS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fetch",
+            action="store_true",
+            help="Download the vendored stylesheet again before building.",
+        )
+
+    def handle(self, *args, **options):
+        vendored = {}
+        for name, url, integrity in assets.VENDOR:
+            path = assets.ASSETS_DIR / name
+            if options["fetch"]:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    content = response.read()
+            else:
+                content = path.read_bytes()
+            if assets.integrity(content) != integrity:
+                raise CommandError(f"{name} does not match {integrity}")
+            if options["fetch"]:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(content)
+            vendored[name] = content
+
+        assets.BUNDLE_DIR.mkdir(parents=True, exist_ok=True)
+        script = assets.minify_js(assets.SCRIPT.read_text())
+        (assets.BUNDLE_DIR / "site.js").write_text(script + "\n")
+
+        css = b"".join(
+            content for name, content in vendored.items() if name.endswith(".css")
+        ).decode()
+        used = assets.used_classes(settings.BASE_DIR)
+        purged = assets.purge(css, used)
+        (assets.BUNDLE_DIR / "site.css").write_text(purged)
+
+        critical = assets.critical(purged)
+        assets.CRITICAL_CSS.write_text(
+            f"{{% verbatim %}}{critical}{{% endverbatim %}}\n"
+        )
+
+        self.stdout.write(
+            f"site.css: {len(css):,} -> {len(purged):,} bytes, "
+            f"{len(critical):,} inlined; site.js: {len(script):,} bytes"
+        )
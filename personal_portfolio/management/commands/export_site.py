@@ -0,0 +1,204 @@
+import json
+import os
+import shutil
+from collections import defaultdict
+from pathlib import Path
+
+from blog.models import Category, Comment, Post
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Max
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from projects.models import Project
+
+from personal_portfolio.cache import _CSRF_VALUE
+from personal_portfolio.middleware import ReplicaMiddleware
+
+STATE_FILE = ".export.json"
+
+
+def snapshot():
+    """What each exported page is rendered from, as stored between exports."""
+    categories = defaultdict(list)
+    for post, category in Post.categories.through.objects.values_list(
+        "post_id", "category_id"
+    ):
+        categories[post].append(str(category))
+    comments = {
+        row["post"]: f"{row['count']}|{row['latest']}"
+        for row in Comment.objects.values("post")
+        .annotate(count=Count("id"), latest=Max("id"))
+        .order_by()
+    }
+    return {
+        "posts": {
+            str(pk): {
+                "modified": modified.isoformat(),
+                "categories": sorted(categories[pk]),
+                "comments": comments.get(pk, ""),
+            }
+            for pk, modified in Post.objects.values_list("pk", "last_modified")
+        },
+        "categories": {
+            str(pk): {"slug": slug, "name": name}
+            for pk, slug, name in Category.objects.values_list("pk", "slug", "name")
+        },
+        "projects": {
+            str(pk): modified.isoformat()
+            for pk, modified in Project.objects.values_list("pk", "last_modified")
+        },
+    }
+
+
+def blog_urls(rows):
+    return {
+        reverse("blog_index"),
+        *(reverse("blog_detail", args=[pk]) for pk in rows["posts"]),
+        *(
+            reverse("blog_category", args=[category["slug"]])
+            for category in rows["categories"].values()
+        ),
+    }
+
+
+def project_urls(rows):
+    return {
+        reverse("home"),
+        *(reverse("project_detail", args=[pk]) for pk in rows["projects"]),
+    }
+
+
+def site_urls(rows):
+    return {reverse("cv")} | project_urls(rows) | blog_urls(rows)
+
+
+def changed_urls(old, new):
+    """The pages showing rows which differ between two snapshots."""
+    if old["categories"] != new["categories"]:
+        # category names and links are on every blog page
+        urls = blog_urls(new)
+    else:
+        urls = set()
+        for pk in old["posts"].keys() | new["posts"].keys():
+            before, after = old["posts"].get(pk), new["posts"].get(pk)
+            if before == after:
+                continue
+            urls.add(reverse("blog_detail", args=[pk]))
+            if before and after and before["modified"] == after["modified"]:
+                if before["categories"] == after["categories"]:
+                    # only the comments, which aren't on the listings
+                    continue
+            urls.add(reverse("blog_index"))
+            for category in {
+                *(before or {}).get("categories", []),
+                *(after or {}).get("categories", []),
+            }:
+                if category in new["categories"]:
+                    slug = new["categories"][category]["slug"]
+                    urls.add(reverse("blog_category", args=[slug]))
+
+    for pk in old["projects"].keys() | new["projects"].keys():
+        if old["projects"].get(pk) != new["projects"].get(pk):
+            urls.add(reverse("home"))
+            urls.add(reverse("project_detail", args=[pk]))
+    return urls
+
+
+def page_path(output, url):
+    return output / url.strip("/") / "index.html"
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the site to static HTML files a web server can serve "
+        "directly, re-rendering only the pages changed since the last export."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Directory to write the site to.")
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Render every page, after changing templates or code.",
+        )
+
+    def handle(self, *args, **options):
+        output = Path(options["output"])
+        state_path = output / STATE_FILE
+        previous = None
+        if state_path.exists():
+            previous = json.loads(state_path.read_text())
+
+        rows = snapshot()
+        urls = site_urls(rows)
+        if previous is None or options["full"]:
+            render = urls
+        else:
+            render = changed_urls(previous["rows"], rows) & urls
+        removed = set(previous["pages"]) - urls if previous else set()
+
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            client = Client()
+            # read what the snapshot was taken from, not a lagging replica
+            client.cookies[ReplicaMiddleware.cookie_name] = "1"
+            for url in sorted(render):
+                self.render(client, output, url)
+        for url in sorted(removed):
+            path = page_path(output, url)
+            path.unlink(missing_ok=True)
+            if path.parent != output and not any(path.parent.iterdir()):
+                path.parent.rmdir()
+        copied = self.copy_static(output)
+
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        state_path.write_text(
+            json.dumps(
+                {
+                    "exported_at": timezone.now().isoformat(),
+                    "pages": sorted(urls),
+                    "rows": rows,
+                }
+            )
+        )
+        self.stdout.write(
+            f"Rendered {len(render)} of {len(urls)} pages, removed {len(removed)}, "
+            f"copied {copied} static files."
+        )
+
+    def render(self, client, output, url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"{url} answered {response.status_code}")
+        path = page_path(output, url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        # an exported page is shared by every visitor, so its form is left for
+        # the page's script to fill in with the visitor's own CSRF token
+        tmp.write_bytes(_CSRF_VALUE.sub(rb"\1\2", response.content))
+        # replace, so the web server never serves a half written page
+        os.replace(tmp, path)
+
+    def copy_static(self, output):
+        """Copy collected static files which are new or changed."""
+        static_root = Path(settings.STATIC_ROOT)
+        if not static_root.is_dir():
+            self.stderr.write(f"{static_root} not found, run collectstatic first.")
+            return 0
+        target = output / settings.STATIC_URL.strip("/")
+        copied = 0
+        for source in static_root.rglob("*"):
+            if not source.is_file():
+                continue
+            destination = target / source.relative_to(static_root)
+            stat = source.stat()
+            if destination.exists():
+                copy = destination.stat()
+                if (copy.st_size, copy.st_mtime) == (stat.st_size, stat.st_mtime):
+                    continue
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, destination)
+            copied += 1
+        return copied
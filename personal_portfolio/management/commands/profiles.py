@@ -0,0 +1,48 @@
+import pstats
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "List captured request profiles, or summarise one of them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("profile", nargs="?", help="Profile file to summarise.")
+        parser.add_argument("--limit", type=int, default=25)
+        parser.add_argument(
+            "--sort", default="cumulative", help="pstats sort key, e.g. tottime."
+        )
+
+    def handle(self, *args, **options):
+        directory = Path(
+            getattr(settings, "PROFILE_DIR", settings.BASE_DIR / "profiles")
+        )
+        if options["profile"]:
+            self.summarise(directory / options["profile"], options)
+        else:
+            self.list(directory)
+
+    def list(self, directory):
+        paths = sorted(directory.glob("*.prof")) if directory.is_dir() else []
+        if not paths:
+            self.stdout.write(f"No profiles in {directory}")
+            return
+        for path in paths:
+            stats = pstats.Stats(str(path))
+            taken = datetime.fromtimestamp(path.stat().st_mtime)
+            self.stdout.write(
+                f"{path.name}  {taken:%Y-%m-%d %H:%M:%S}  "
+                f"{stats.total_tt * 1000:.1f}ms  {stats.total_calls} calls"
+            )
+
+    def summarise(self, path, options):
+        if not path.is_file():
+            raise CommandError(f"No profile at {path}")
+        output = StringIO()
+        stats = pstats.Stats(str(path), stream=output)
+        stats.strip_dirs().sort_stats(options["sort"]).print_stats(options["limit"])
+        self.stdout.write(output.getvalue())
@@ -0,0 +1,143 @@
+import random
+from itertools import accumulate
+
+from blog import search
+from blog.models import Category, Comment, Post
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from projects.models import Project
+
+WORDS = (
+    "django python query index cache template view model sqlite request "
+    "response page blog project comment category render profile latency "
+    "database server worker static image feed search scrape beer data"
+).split()
+
+
+def sentence(words=12):
+    return " ".join(random.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def paragraph(sentences=5):
+    return " ".join(sentence() for _ in range(sentences))
+
+
+class Command(BaseCommand):
+    help = "Fill the database with generated posts, comments and projects."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--categories-per-post", type=int, default=3)
+        parser.add_argument("--comments", type=int, default=10000)
+        parser.add_argument("--projects", type=int, default=10)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        self.batch_size = options["batch_size"]
+
+        with transaction.atomic():
+            categories = self.seed_categories(options["categories"])
+            post_ids = self.seed_posts(
+                options["posts"], categories, options["categories_per_post"]
+            )
+            self.seed_comments(options["comments"], post_ids)
+            self.seed_projects(options["projects"])
+
+        # bulk inserts skip the model signals that maintain these
+        search.rebuild_index()
+        cache.clear()
+
+    def new_ids(self, model, start):
+        return list(model.objects.filter(pk__gt=start).values_list("pk", flat=True))
+
+    def last_id(self, model):
+        return model.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+    def bulk_create(self, model, objects):
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch)
+                batch = []
+        model.objects.bulk_create(batch)
+
+    def seed_categories(self, count):
+        start = self.last_id(Category)
+        self.bulk_create(
+            Category,
+            (
+                Category(name=f"Category {start + i}", slug=f"category-{start + i}")
+                for i in range(1, count + 1)
+            ),
+        )
+        self.stdout.write(f"Created {count} categories")
+        return self.new_ids(Category, start)
+
+    def seed_posts(self, count, categories, per_post):
+        def posts():
+            for i in range(count):
+                post = Post(
+                    title=sentence(6)[:-1],
+                    body="\n\n".join(paragraph() for _ in range(4)),
+                    link="https://github.com/LucasSD/rp_portfolio",
+                )
+                post.render()
+                yield post
+
+        start = self.last_id(Post)
+        self.bulk_create(Post, posts())
+        post_ids = self.new_ids(Post, start)
+
+        Link = Post.categories.through
+        per_post = min(per_post, len(categories))
+        self.bulk_create(
+            Link,
+            (
+                Link(post_id=post_id, category_id=category_id)
+                for post_id in post_ids
+                for category_id in random.sample(categories, per_post)
+            ),
+        )
+        self.stdout.write(f"Created {count} posts")
+        return post_ids
+
+    def seed_comments(self, count, post_ids):
+        if not post_ids:
+            return
+        # a few popular posts get most of the comments
+        cum_weights = list(accumulate(1 / rank for rank in range(1, len(post_ids) + 1)))
+        self.bulk_create(
+            Comment,
+            (
+                Comment(
+                    author=f"Reader {i % 500}",
+                    body=sentence(),
+                    post_id=random.choices(post_ids, cum_weights=cum_weights)[0],
+                )
+                for i in range(count)
+            ),
+        )
+        self.stdout.write(f"Created {count} comments")
+
+    def seed_projects(self, count):
+        self.bulk_create(
+            Project,
+            (
+                Project(
+                    title=f"Project {i}",
+                    description=paragraph(),
+                    summary=sentence(8)[:100],
+                    technology="Django, SQLite",
+                    image="img/projects.png",
+                    repo="https://github.com/LucasSD/rp_portfolio",
+                    order=i,
+                )
+                for i in range(count)
+            ),
+        )
+        self.stdout.write(f"Created {count} projects")
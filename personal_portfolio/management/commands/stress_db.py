@@ -0,0 +1,119 @@
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+POSTS = 100
+
+DEFAULT_CONFIG = {"ENGINE": "django.db.backends.sqlite3"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare read and write throughput of Django's default SQLite setup "
+        "and DATABASES['default'] under concurrent requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=4)
+
+    def handle(self, *args, **options):
+        configured = {
+            key: value
+            for key, value in settings.DATABASES["default"].items()
+            if key in ("ENGINE", "OPTIONS", "CONN_MAX_AGE")
+        }
+        results = {}
+        for name, config in (("default", DEFAULT_CONFIG), ("configured", configured)):
+            with tempfile.TemporaryDirectory() as directory:
+                config = {**config, "NAME": str(Path(directory) / "stress.sqlite3")}
+                results[name] = self.run(config, options)
+            self.stdout.write(
+                f"{name:>10}: {results[name]['reads']:8.1f} reads/s "
+                f"{results[name]['writes']:8.1f} writes/s "
+                f"{results[name]['errors']:6d} lock errors"
+            )
+
+    def run(self, config, options):
+        alias = f"stress-{time.monotonic_ns()}"
+        connections.databases[alias] = config
+        try:
+            self.create_schema(alias)
+            counts = {"reads": 0, "writes": 0, "errors": 0}
+            lock = threading.Lock()
+            deadline = time.monotonic() + options["seconds"]
+            threads = [
+                threading.Thread(
+                    target=self.work, args=(alias, write, deadline, counts, lock)
+                )
+                for write in [False] * options["readers"] + [True] * options["writers"]
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            del connections.databases[alias]
+        return {
+            "reads": counts["reads"] / options["seconds"],
+            "writes": counts["writes"] / options["seconds"],
+            "errors": counts["errors"],
+        }
+
+    def create_schema(self, alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE comment (id INTEGER PRIMARY KEY, post_id INTEGER, "
+                "author TEXT, body TEXT, created_on REAL)"
+            )
+            cursor.execute("CREATE INDEX comment_post_idx ON comment (post_id, id)")
+        connections[alias].close()
+
+    def work(self, alias, write, deadline, counts, lock):
+        connection = connections[alias]
+        try:
+            while time.monotonic() < deadline:
+                # one request: a page view, or a comment on a post
+                post_id = random.randrange(POSTS)
+                try:
+                    if write:
+                        self.write(alias, post_id)
+                    else:
+                        self.read(alias, post_id)
+                except OperationalError:
+                    outcome = "errors"
+                else:
+                    outcome = "writes" if write else "reads"
+                with lock:
+                    counts[outcome] += 1
+                # what the request_finished signal does
+                connection.close_if_unusable_or_obsolete()
+        finally:
+            connection.close()
+
+    def read(self, alias, post_id):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "SELECT id, author, body FROM comment WHERE post_id = %s "
+                "ORDER BY id DESC LIMIT 20",
+                [post_id],
+            )
+            cursor.fetchall()
+
+    def write(self, alias, post_id):
+        # like a view that reads before it saves
+        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM comment WHERE post_id = %s", [post_id])
+            cursor.fetchone()
+            cursor.execute(
+                "INSERT INTO comment (post_id, author, body, created_on) "
+                "VALUES (%s, %s, %s, %s)",
+                [post_id, "Stress", "x" * 200, time.time()],
+            )
@@ -0,0 +1,151 @@
+"""In-process request metrics in the Prometheus text format.
+
+Each thread records into its own shard, so observing a request takes no
+lock. The shards are only merged when ``/metrics`` is scraped.
+"""
+
+import hmac
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+HISTOGRAMS = (
+    (
+        "latency",
+        "http_request_duration_seconds",
+        "Time spent handling requests.",
+        LATENCY_BUCKETS,
+    ),
+    ("size", "http_response_size_bytes", "Size of response bodies.", SIZE_BUCKETS),
+    (
+        "queries",
+        "http_request_db_queries",
+        "Database queries per request.",
+        QUERY_BUCKETS,
+    ),
+)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # the last slot counts values above the largest bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class ViewMetrics:
+    __slots__ = ("latency", "size", "queries", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.statuses = {}
+
+
+class Registry:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            # list.append is atomic, so registering a shard needs no lock
+            self._shards.append(shard)
+            return shard
+
+    def observe(self, view, status, seconds, size, queries):
+        shard = self._shard()
+        metrics = shard.get(view)
+        if metrics is None:
+            metrics = shard[view] = ViewMetrics()
+        metrics.latency.observe(seconds)
+        metrics.size.observe(size)
+        metrics.queries.observe(queries)
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def reset(self):
+        self._local = threading.local()
+        self._shards = []
+
+    def collect(self):
+        """Merge every thread's shard into ``{view: ViewMetrics}``."""
+        merged = {}
+        for shard in list(self._shards):
+            # copying a dict of str keys is atomic under the GIL, so this
+            # doesn't race with the owning thread adding a view
+            for view, metrics in list(shard.items()):
+                total = merged.setdefault(view, ViewMetrics())
+                for name, *_ in HISTOGRAMS:
+                    source, target = getattr(metrics, name), getattr(total, name)
+                    target.counts = [
+                        a + b for a, b in zip(target.counts, source.counts)
+                    ]
+                    target.sum += source.sum
+                for status, count in list(metrics.statuses.items()):
+                    total.statuses[status] = total.statuses.get(status, 0) + count
+        return merged
+
+    def render(self):
+        merged = sorted(self.collect().items())
+        lines = []
+        for attr, name, help_text, buckets in HISTOGRAMS:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for view, metrics in merged:
+                histogram = getattr(metrics, attr)
+                cumulative = 0
+                for bound, count in zip((*buckets, "+Inf"), histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{name}_bucket{{view="{view}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f'{name}_sum{{view="{view}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{view="{view}"}} {cumulative}')
+
+        lines += [
+            "# HELP http_responses_total Responses by status code.",
+            "# TYPE http_responses_total counter",
+        ]
+        for view, metrics in merged:
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(
+                    f'http_responses_total{{view="{view}",status="{status}"}} {count}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def metrics_enabled():
+    return getattr(settings, "METRICS_ENABLED", False)
+
+
+def metrics_view(request):
+    if not metrics_enabled():
+        raise Http404("Metrics are disabled")
+    token = getattr(settings, "METRICS_TOKEN", None)
+    if token:
+        authorization = request.headers.get("Authorization", "").encode()
+        # in constant time, so the token can't be guessed a byte at a time
+        if not hmac.compare_digest(authorization, f"Bearer {token}".encode()):
+            return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
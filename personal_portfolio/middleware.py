@@ -0,0 +1,202 @@
+import cProfile
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from personal_portfolio.metrics import metrics_enabled, registry
+from personal_portfolio.routers import replica_configured, use_replica
+from personal_portfolio.timing import RequestTimer
+
+logger = logging.getLogger("personal_portfolio.performance")
+
+# the slowest statements included in a slow request's log entry
+SLOW_LOG_QUERIES = 10
+
+
+class ServerTimingMiddleware:
+    """Report SQL, template and total time in a ``Server-Timing`` header.
+
+    Requests slower than the ``SLOW_REQUEST_THRESHOLD_MS`` setting are also
+    logged with their slowest SQL statements.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        threshold = getattr(settings, "SLOW_REQUEST_THRESHOLD_MS", None)
+        timer = RequestTimer(record_sql=threshold is not None)
+        request.server_timing = timer
+
+        token = timer.activate()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            timer.deactivate(token)
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f"db;dur={timer.sql_time * 1000:.2f};"
+                f'desc="{timer.query_count} queries"',
+                f"tpl;dur={timer.template_time * 1000:.2f}",
+                f"total;dur={timer.total_time * 1000:.2f}",
+            ]
+        )
+        if threshold is not None and timer.total_time * 1000 > threshold:
+            self.log_slow_request(request, timer)
+        return response
+
+    def log_slow_request(self, request, timer):
+        slowest = sorted(timer.queries, key=lambda query: query[0], reverse=True)
+        statements = "".join(
+            f"\n  {duration * 1000:.2f}ms {sql}"
+            for duration, sql in slowest[:SLOW_LOG_QUERIES]
+        )
+        logger.warning(
+            "Slow request %s %s took %.1fms (%d queries, %.1fms SQL, "
+            "%.1fms templates)%s",
+            request.method,
+            request.get_full_path(),
+            timer.total_time * 1000,
+            timer.query_count,
+            timer.sql_time * 1000,
+            timer.template_time * 1000,
+            statements,
+        )
+
+
+class MetricsMiddleware:
+    """Record latency, size, status and query count per URL name.
+
+    Must come before ``ServerTimingMiddleware``, whose timer supplies the
+    query count. Does nothing unless the ``METRICS_ENABLED`` setting is on.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not metrics_enabled():
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.url_name if match is not None and match.url_name else "unmatched"
+        timer = getattr(request, "server_timing", None)
+        registry.observe(
+            view,
+            response.status_code,
+            duration,
+            0 if response.streaming else len(response.content),
+            timer.query_count if timer is not None else 0,
+        )
+        return response
+
+
+class ProfilingMiddleware:
+    """Run a staff member's request under cProfile when they ask for it.
+
+    Add ``?profile=1`` or an ``X-Profile: 1`` header to a request to have
+    its profile written to ``PROFILE_DIR``, ready for pstats, snakeviz or
+    flameprof. Needs the ``PROFILING_ENABLED`` setting, and at most
+    ``PROFILE_RATE_LIMIT`` profiles are taken a minute. Must come after
+    ``AuthenticationMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.recent = deque()
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if not self.wants_profile(request) or not self.within_rate_limit():
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        response = profiler.runcall(self.get_response, request)
+
+        directory = Path(
+            getattr(settings, "PROFILE_DIR", settings.BASE_DIR / "profiles")
+        )
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / self.filename(request)
+        profiler.dump_stats(path)
+        response["X-Profile"] = path.name
+        return response
+
+    def wants_profile(self, request):
+        return (
+            getattr(settings, "PROFILING_ENABLED", False)
+            and (
+                request.GET.get("profile") == "1"
+                or request.headers.get("X-Profile") == "1"
+            )
+            and request.user.is_staff
+        )
+
+    def within_rate_limit(self):
+        limit = getattr(settings, "PROFILE_RATE_LIMIT", 6)
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and now - self.recent[0] > 60:
+                self.recent.popleft()
+            if len(self.recent) >= limit:
+                return False
+            self.recent.append(now)
+            return True
+
+    def filename(self, request):
+        path = re.sub(r"[^\w-]+", "_", request.path).strip("_") or "root"
+        stamp = timezone.now().strftime("%Y%m%d-%H%M%S-%f")
+        return f"{stamp}-{request.method}-{path}.prof"
+
+
+class ReplicaMiddleware:
+    """Read site content from the replica database, unless a visitor wrote.
+
+    Safe requests read from the replica. Other requests read from the
+    primary, and a successful one sets a cookie that keeps the visitor on
+    the primary for the next ``REPLICA_PIN_SECONDS``, long enough for the
+    replica to catch up with what they wrote.
+    """
+
+    cookie_name = "pin_primary"
+    safe_methods = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+
+        if request.method not in self.safe_methods:
+            response = self.get_response(request)
+            if response.status_code < 400:
+                response.set_cookie(
+                    self.cookie_name,
+                    "1",
+                    max_age=getattr(settings, "REPLICA_PIN_SECONDS", 10),
+                    httponly=True,
+                    samesite="Lax",
+                )
+            return response
+
+        if self.cookie_name in request.COOKIES:
+            return self.get_response(request)
+        with use_replica():
+            return self.get_response(request)
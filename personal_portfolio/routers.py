@@ -0,0 +1,73 @@
+"""Send reads of site content made by page views to a read replica.
+
+When a ``replica`` database is configured, ``ReplicaRouter`` sends reads of
+the ``REPLICA_APPS`` models made inside ``use_replica()`` to it, and every
+other query to ``default``. ``ReplicaMiddleware`` wraps read-only requests
+in ``use_replica()``, so management commands, migrations and background
+work keep reading what they write.
+
+Sessions and users are always read from ``default``, as a visitor must be
+able to read back the session they were just given.
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA = "replica"
+
+DEFAULT_APPS = ("blog", "projects")
+
+_replica_reads = contextvars.ContextVar("replica_reads", default=False)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def _reads_from_replica(value):
+    token = _replica_reads.set(value)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def use_replica():
+    """Send content reads made inside the block to the replica."""
+    return _reads_from_replica(True)
+
+
+def use_primary():
+    """Send reads made inside the block to the primary, even in ``use_replica``."""
+    return _reads_from_replica(False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            # follow an object's relations on the database it came from
+            return instance._state.db
+        apps = getattr(settings, "REPLICA_APPS", DEFAULT_APPS)
+        if (
+            _replica_reads.get()
+            and model._meta.app_label in apps
+            and replica_configured()
+        ):
+            return REPLICA
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # the replica gets its schema along with its data from the primary
+        return db != REPLICA
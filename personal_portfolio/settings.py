@@ -38,16 +38,21 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "projects",
-    "blog",
+    "personal_portfolio",
+    "projects.apps.ProjectsConfig",
+    "blog.apps.BlogConfig",
 ]
 
 MIDDLEWARE = [
+    "personal_portfolio.middleware.MetricsMiddleware",
+    "personal_portfolio.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "personal_portfolio.middleware.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "personal_portfolio.middleware.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -56,9 +61,8 @@ ROOT_URLCONF = "personal_portfolio.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": ["rp_portfolio/personal_portfolio/templates/"],
-        "APP_DIRS": True,
+        "BACKEND": "personal_portfolio.template_backend.TimedDjangoTemplates",
+        "DIRS": [BASE_DIR / "personal_portfolio" / "templates"],
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
@@ -66,23 +70,106 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            # compiled templates are kept in memory for the life of the worker
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
         },
     },
 ]
 
+# compile every template when a worker starts, see personal_portfolio/wsgi.py
+TEMPLATE_WARMUP = True
+
 WSGI_APPLICATION = "personal_portfolio.wsgi.application"
 
 
 # Database
 # https://docs.djangoproject.com/en/3.1/ref/settings/#databases
 
+# SQLite tuned for concurrent requests, see personal_portfolio/db/sqlite3/base.py
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": "personal_portfolio.db.sqlite3",
         "NAME": str(BASE_DIR / "db.sqlite3"),
+        "CONN_MAX_AGE": 600,
+        "OPTIONS": {
+            # seconds to wait for another connection's write lock
+            "timeout": 5,
+            "transaction_mode": "IMMEDIATE",
+            "pragmas": {
+                "journal_mode": "WAL",
+                # in WAL mode a crash can lose the last commits, not corrupt
+                "synchronous": "NORMAL",
+                "mmap_size": 128 * 1024 * 1024,
+                # negative means KiB rather than pages
+                "cache_size": -20000,
+            },
+            "retries": 3,
+        },
     }
 }
 
+# a copy of the database to send blog and project reads to, e.g. a second
+# SQLite file kept in sync from the first, see personal_portfolio/routers.py
+if os.getenv("DATABASE_REPLICA"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("DATABASE_REPLICA"),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["personal_portfolio.routers.ReplicaRouter"]
+
+# seconds a visitor's reads stay on the primary after they write
+REPLICA_PIN_SECONDS = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+# a file cache is shared by all web workers, so a page invalidated by one
+# worker isn't served stale by another
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": str(BASE_DIR / "cache"),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    # fragments keyed by their content, which can't go stale, so each worker
+    # keeps its own, see blog/templatetags/blog_tags.py
+    "fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "fragments",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+# cache rendered blog and project pages, see personal_portfolio/cache.py
+PAGE_CACHE = True
+
+
+# log requests slower than this, see personal_portfolio/middleware.py
+SLOW_REQUEST_THRESHOLD_MS = 500
+
+# serve Prometheus metrics at /metrics, see personal_portfolio/metrics.py
+METRICS_ENABLED = os.getenv("METRICS_ENABLED") == "1"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# let staff profile a request with ?profile=1, see personal_portfolio/middleware.py
+PROFILING_ENABLED = True
+PROFILE_DIR = BASE_DIR / "profiles"
+
+# queue comments in a spool and save them in batches, see blog/spool.py
+COMMENT_WRITE_BEHIND = os.getenv("COMMENT_WRITE_BEHIND") == "1"
+COMMENT_SPOOL_DIR = BASE_DIR / "spool"
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
@@ -122,3 +209,10 @@ USE_TZ = True
 
 STATIC_ROOT = "/home/lucasstonedrake/rp_portfolio/static"
 STATIC_URL = "/static/"
+
+# content hashed names and gzip/brotli copies, see personal_portfolio/storage.py
+STATICFILES_STORAGE = "personal_portfolio.storage.CompressedManifestStaticFilesStorage"
+
+# serve STATIC_ROOT from the app with far future caching, see
+# personal_portfolio/static.py
+SERVE_STATIC = True
@@ -37,16 +37,21 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "projects",
-    "blog",
+    "personal_portfolio",
+    "projects.apps.ProjectsConfig",
+    "blog.apps.BlogConfig",
 ]
 
 MIDDLEWARE = [
+    "personal_portfolio.middleware.MetricsMiddleware",
+    "personal_portfolio.middleware.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "personal_portfolio.middleware.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "personal_portfolio.middleware.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -55,11 +60,8 @@ ROOT_URLCONF = "personal_portfolio.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [
-            "rp_portfolio/personal_portfolio/templates/",
-            "personal_portfolio/templates/",
-        ],
+        "BACKEND": "personal_portfolio.template_backend.TimedDjangoTemplates",
+        "DIRS": [BASE_DIR / "personal_portfolio" / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
             "debug": DEBUG,
@@ -75,15 +77,61 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "personal_portfolio.wsgi.application"
 
+# fail tests whose requests go over their query budget
+TEST_RUNNER = "personal_portfolio.budgets.BudgetTestRunner"
+
 
 # Database
 # https://docs.djangoproject.com/en/3.1/ref/settings/#databases
 
+# SQLite tuned for concurrent requests, see personal_portfolio/db/sqlite3/base.py
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        "ENGINE": "personal_portfolio.db.sqlite3",
         "NAME": str(BASE_DIR / "db.sqlite3"),
+        "CONN_MAX_AGE": 600,
+        "OPTIONS": {
+            # seconds to wait for another connection's write lock
+            "timeout": 5,
+            "transaction_mode": "IMMEDIATE",
+            "pragmas": {
+                "journal_mode": "WAL",
+                # in WAL mode a crash can lose the last commits, not corrupt
+                "synchronous": "NORMAL",
+                "mmap_size": 128 * 1024 * 1024,
+                # negative means KiB rather than pages
+                "cache_size": -20000,
+            },
+            "retries": 3,
+        },
+    }
+}
+
+# a copy of the database to send blog and project reads to, e.g. a second
+# SQLite file kept in sync from the first, see personal_portfolio/routers.py
+if os.getenv("DATABASE_REPLICA"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("DATABASE_REPLICA"),
+        "TEST": {"MIRROR": "default"},
     }
+
+DATABASE_ROUTERS = ["personal_portfolio.routers.ReplicaRouter"]
+
+# seconds a visitor's reads stay on the primary after they write
+REPLICA_PIN_SECONDS = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    # see blog/templatetags/blog_tags.py
+    "fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "fragments",
+    },
 }
 
 
@@ -0,0 +1,92 @@
+"""An XML sitemap index of the portfolio, the CV, the blog and every post.
+
+Posts are listed in chunks of ``SITEMAP_CHUNK_SIZE`` consecutive primary
+keys, so a post stays in the same chunk as others are added or removed.
+Each chunk is cached under its own tag, which is invalidated when one of
+its posts is saved, so editing a post only renders that chunk again.
+"""
+
+from blog.models import Category, Post
+from django.conf import settings
+from django.db.models import F, Max
+from django.http import Http404
+from django.shortcuts import render
+from django.urls import reverse
+from projects.models import Project
+
+from personal_portfolio.cache import cached_page
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _chunk_size():
+    return getattr(settings, "SITEMAP_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def chunk_tag(pk):
+    """The page cache tag of the sitemap chunk listing post ``pk``."""
+    return f"sitemap:{pk // _chunk_size()}"
+
+
+def _render(request, template_name, entries):
+    context = {
+        "entries": [
+            (request.build_absolute_uri(url), lastmod) for url, lastmod in entries
+        ]
+    }
+    return render(request, template_name, context, content_type="application/xml")
+
+
+@cached_page("posts", "projects")
+def sitemap_index(request):
+    chunks = (
+        Post.objects.annotate(chunk=F("pk") / _chunk_size())
+        .values("chunk")
+        .annotate(lastmod=Max("last_modified"))
+        .order_by("chunk")
+    )
+    entries = [
+        (reverse("sitemap_posts", kwargs={"chunk": row["chunk"]}), row["lastmod"])
+        for row in chunks
+    ]
+    projects = Project.objects.aggregate(lastmod=Max("last_modified"))["lastmod"]
+    lastmods = [projects, *(lastmod for _, lastmod in entries)]
+    entries.insert(
+        0, (reverse("sitemap_pages"), max(filter(None, lastmods), default=None))
+    )
+    return _render(request, "sitemap_index.xml", entries)
+
+
+@cached_page("posts", "projects")
+def sitemap_pages(request):
+    """Every page but the posts."""
+    projects = list(Project.objects.order_by("order").only("pk", "last_modified"))
+    categories = Category.objects.annotate(lastmod=Max("posts__last_modified"))
+    posts = Post.objects.aggregate(lastmod=Max("last_modified"))["lastmod"]
+    entries = [
+        (reverse("home"), max((p.last_modified for p in projects), default=None)),
+        *((project.get_absolute_url(), project.last_modified) for project in projects),
+        (reverse("cv"), None),
+        (reverse("blog_index"), posts),
+        *(
+            (category.get_absolute_url(), category.lastmod)
+            for category in categories.order_by("slug")
+        ),
+    ]
+    return _render(request, "sitemap.xml", entries)
+
+
+@cached_page("sitemap:{chunk}")
+def sitemap_posts(request, chunk):
+    size = _chunk_size()
+    posts = (
+        Post.objects.filter(pk__gte=chunk * size, pk__lt=(chunk + 1) * size)
+        .order_by("pk")
+        .values_list("pk", "last_modified")
+    )
+    entries = [
+        (reverse("blog_detail", kwargs={"pk": pk}), lastmod) for pk, lastmod in posts
+    ]
+    if not entries:
+        raise Http404("No such sitemap")
+    return _render(request, "sitemap.xml", entries)
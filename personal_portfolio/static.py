@@ -0,0 +1,164 @@
+"""Serve collected static files with long-lived caching.
+
+Files whose names carry the content hash added by ``collectstatic`` are
+served as immutable for a year: a changed file gets a new name, so a
+browser never has to ask for the same one again. The gzip or brotli copy
+made by ``personal_portfolio.storage`` is served to browsers that accept
+it, and byte ranges are supported for resuming downloads like the CV.
+"""
+
+import mimetypes
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+# ManifestStaticFilesStorage names files like "app.0123456789ab.css"
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^/]+$")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+DEFAULT_MAX_AGE = 60 * 60
+
+# preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _accepted_encodings(request):
+    accepted = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        try:
+            quality = float(next((p[2:] for p in params if p.startswith("q=")), 1))
+        except ValueError:
+            continue
+        if coding and quality > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def _parse_range(header, size):
+    """The ``(start, end)`` of a single byte range, inclusive.
+
+    None if the header isn't one valid byte range, so it's ignored and the
+    whole file served, and ``()`` if it is but no byte of the file is in it.
+    """
+    match = RANGE.match(header.strip())
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start:
+        if not end:
+            return None
+        # the last ``end`` bytes
+        if not int(end) or not size:
+            return ()
+        return max(0, size - int(end)), size - 1
+    start = int(start)
+    if end and int(end) < start:
+        return None
+    if start >= size:
+        return ()
+    end = min(int(end), size - 1) if end else size - 1
+    return start, end
+
+
+def _if_range_matches(request, mtime):
+    """Whether the Range header is to be used given the If-Range header.
+
+    No ETag is sent, so only the Last-Modified date can match.
+    """
+    if_range = request.headers.get("If-Range")
+    if if_range is None:
+        return True
+    return parse_http_date_safe(if_range) == int(mtime)
+
+
+@require_safe
+def serve(request, path):
+    if not getattr(settings, "SERVE_STATIC", False):
+        raise Http404("Not found")
+    try:
+        full_path = Path(safe_join(settings.STATIC_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404("Not found")
+    if not full_path.is_file():
+        raise Http404("Not found")
+
+    stat = full_path.stat()
+    if not was_modified_since(
+        request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime, stat.st_size
+    ):
+        response = HttpResponseNotModified()
+    else:
+        response = _file_response(request, full_path, stat)
+    response["Last-Modified"] = http_date(stat.st_mtime)
+
+    if HASHED_NAME.search(path):
+        response["Cache-Control"] = IMMUTABLE
+    else:
+        max_age = getattr(settings, "STATIC_MAX_AGE", DEFAULT_MAX_AGE)
+        response["Cache-Control"] = f"public, max-age={max_age}"
+    response["Vary"] = "Accept-Encoding"
+    return response
+
+
+def _file_response(request, full_path, stat):
+    content_type, _ = mimetypes.guess_type(str(full_path))
+    content_type = content_type or "application/octet-stream"
+    size = stat.st_size
+
+    range_header = request.headers.get("Range")
+    byte_range = None
+    if range_header is not None and _if_range_matches(request, stat.st_mtime):
+        byte_range = _parse_range(range_header, size)
+    if byte_range == ():
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+    if byte_range is not None:
+        # ranges are of the file itself, so they're never served compressed
+        start, end = byte_range
+        f = open(full_path, "rb")
+        f.seek(start)
+        response = FileResponse(_limit(f, end - start + 1), content_type=content_type)
+        response.status_code = 206
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = end - start + 1
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    accepted = _accepted_encodings(request)
+    for encoding, suffix in ENCODINGS:
+        compressed = full_path.with_name(full_path.name + suffix)
+        if encoding in accepted and compressed.is_file():
+            response = FileResponse(
+                open(compressed, "rb"),
+                content_type=content_type,
+                filename=full_path.name,
+            )
+            response["Content-Encoding"] = encoding
+            return response
+
+    response = FileResponse(open(full_path, "rb"), content_type=content_type)
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def _limit(f, length, chunk_size=64 * 1024):
+    try:
+        while length > 0:
+            chunk = f.read(min(chunk_size, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
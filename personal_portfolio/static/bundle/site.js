@@ -0,0 +1,7 @@
+document.querySelectorAll('[data-toggle="collapse"]').forEach(function (toggler) {
+var target = document.querySelector(toggler.getAttribute("data-target"));
+toggler.addEventListener("click", function () {
+var shown = target.classList.toggle("show");
+toggler.setAttribute("aria-expanded", String(shown));
+});
+});
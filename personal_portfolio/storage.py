@@ -0,0 +1,80 @@
+"""Static files storage that names files by content and precompresses them.
+
+``collectstatic`` with ``CompressedManifestStaticFilesStorage`` stores a
+copy of each file with a hash of its contents in the name, so the copies
+can be cached forever, see ``personal_portfolio.static``. Files with the
+same contents are given the same hashed name, so browsers only fetch them
+once. Text files also get gzip, and when the brotli package is installed
+brotli, copies next to them for the server to pick from.
+"""
+
+import gzip
+import hashlib
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# formats which are compressed already
+SKIP_EXTENSIONS = {
+    ".avif",
+    ".br",
+    ".gif",
+    ".gz",
+    ".jpeg",
+    ".jpg",
+    ".png",
+    ".webp",
+    ".woff",
+    ".woff2",
+    ".zip",
+}
+
+# a compressed copy that saves less than this isn't worth serving
+MIN_SAVING = 0.05
+
+
+def _compressors():
+    yield ".gz", lambda content: gzip.compress(content, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", lambda content: brotli.compress(content, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            self.compress(name)
+
+    def save_manifest(self):
+        self.deduplicate()
+        super().save_manifest()
+
+    def deduplicate(self):
+        """Point the manifest entries of identical files at one hashed file."""
+        by_digest = {}
+        for name, hashed_name in sorted(self.hashed_files.items()):
+            with self.open(hashed_name) as f:
+                digest = hashlib.md5(f.read()).hexdigest()
+            ext = os.path.splitext(name)[1]
+            self.hashed_files[name] = by_digest.setdefault((digest, ext), hashed_name)
+
+    def compress(self, name):
+        if os.path.splitext(name)[1].lower() in SKIP_EXTENSIONS:
+            return
+        with self.open(name) as f:
+            content = f.read()
+        for suffix, compress in _compressors():
+            compressed = compress(content)
+            if len(compressed) > len(content) * (1 - MIN_SAVING):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
@@ -0,0 +1,61 @@
+import logging
+from pathlib import Path
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates, Template
+from django.template.utils import get_app_template_dirs
+
+from personal_portfolio.timing import current_timer
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_SUFFIXES = {".html", ".txt", ".xml"}
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timer = current_timer()
+        if timer is None:
+            return super().render(context, request)
+        render = super().render
+        return timer.time_render(lambda: render(context, request))
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, reporting render time to the request timer."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+def warm_templates():
+    """Compile every template so the cached loader has them before a request.
+
+    Returns the number of templates compiled. Templates that fail to compile
+    are logged rather than stopping the worker from starting.
+    """
+    count = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        # the app directories are searched by the app_directories loader
+        # even when APP_DIRS is off because the loaders are listed
+        directories = dict.fromkeys(
+            [*backend.engine.dirs, *get_app_template_dirs("templates")]
+        )
+        for directory in directories:
+            directory = Path(directory)
+            for path in sorted(directory.rglob("*")):
+                if not path.is_file() or path.suffix not in TEMPLATE_SUFFIXES:
+                    continue
+                name = path.relative_to(directory).as_posix()
+                try:
+                    backend.get_template(name)
+                except (TemplateDoesNotExist, TemplateSyntaxError):
+                    logger.exception("Couldn't compile template %s", name)
+                else:
+                    count += 1
+    return count
@@ -0,0 +1,111 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase
+
+from personal_portfolio import assets
+
+CSS = (
+    '/*! license */@charset "UTF-8";'
+    "body{margin:0}"
+    ".navbar,.jumbotron{display:flex}"
+    ".btn:not(:disabled){cursor:pointer}"
+    ".table td{padding:0}"
+    'a[href^="{"]{color:red}'
+    "@media (min-width:768px){.col-md-4{flex:0 0 33%}.col-sm-3{flex:0 0 25%}}"
+    "@media print{.badge{border:0}.navbar{display:none}}"
+    "@font-face{font-family:x}"
+)
+
+
+class PurgeTest(SimpleTestCase):
+    def test_drops_unused_selectors(self):
+        purged = assets.purge(CSS, {"navbar", "btn", "col-md-4"})
+
+        self.assertIn(".navbar{display:flex}", purged)
+        self.assertNotIn("jumbotron", purged)
+        self.assertIn(".btn:not(:disabled)", purged)
+        self.assertNotIn(".table", purged)
+        self.assertIn("@media (min-width:768px){.col-md-4{flex:0 0 33%}}", purged)
+        self.assertIn("@media print{.navbar{display:none}}", purged)
+
+    def test_keeps_elements_at_rules_and_license(self):
+        purged = assets.purge(CSS, set())
+
+        self.assertTrue(purged.startswith('/*! license */@charset "UTF-8";'))
+        self.assertIn("body{margin:0}", purged)
+        self.assertIn('a[href^="{"]{color:red}', purged)
+        self.assertIn("@font-face{font-family:x}", purged)
+
+    def test_critical(self):
+        critical = assets.critical(assets.purge(CSS, {"navbar", "btn", "badge"}))
+
+        self.assertEqual("body{margin:0}.navbar{display:flex}", critical)
+
+    def test_used_classes(self):
+        used = assets.used_classes(Path(__file__).resolve().parents[2])
+
+        for name in ["navbar-toggler", "card-img-top", "form-control", "show"]:
+            self.assertIn(name, used)
+
+
+class MinifyJsTest(SimpleTestCase):
+    def test_drops_comments_and_indentation(self):
+        source = "// a comment\nif (a) {\n\n    b('//');\n}\n"
+
+        self.assertEqual("if (a) {\nb('//');\n}", assets.minify_js(source))
+
+
+class BuildAssetsCommandTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        for name, value in [
+            ("BUNDLE_DIR", self.directory / "bundle"),
+            ("CRITICAL_CSS", self.directory / "_critical.css"),
+        ]:
+            patcher = mock.patch.object(assets, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_builds_bundles(self):
+        call_command("build_assets", stdout=StringIO())
+
+        script = (self.directory / "bundle" / "site.js").read_text()
+        self.assertIn('classList.toggle("show")', script)
+        self.assertNotIn("//", script)
+        self.assertLess(len(script), 1024)
+        css = (self.directory / "bundle" / "site.css").read_text()
+        self.assertIn(".navbar-toggler", css)
+        self.assertNotIn(".jumbotron", css)
+        critical = (self.directory / "_critical.css").read_text()
+        self.assertTrue(critical.startswith("{% verbatim %}"))
+        self.assertIn(".card-body", critical)
+        self.assertIn(".navbar-toggler", critical)
+        self.assertNotIn(".btn", critical)
+        self.assertNotIn("@media print", critical)
+        self.assertLess(len(critical), 5 * 1024)
+
+    def test_checks_integrity(self):
+        vendor = self.directory / "vendor"
+        shutil.copytree(assets.ASSETS_DIR, vendor)
+        (vendor / "bootstrap.min.css").write_text("body{}")
+
+        with mock.patch.object(assets, "ASSETS_DIR", vendor):
+            with self.assertRaisesMessage(CommandError, "bootstrap.min.css"):
+                call_command("build_assets", stdout=StringIO())
+
+
+class BaseTemplateTest(SimpleTestCase):
+    def test_no_third_party_assets(self):
+        html = render_to_string("base.html")
+
+        self.assertIn("<style>*,::after,::before{box-sizing:border-box}", html)
+        self.assertIn('/bundle/site.js" defer>', html)
+        self.assertIn('rel="preload" href="/static/bundle/site.css"', html)
+        self.assertNotIn("https://", html)
@@ -0,0 +1,84 @@
+import os
+import statistics
+import time
+from io import StringIO
+from unittest import mock, skipUnless
+
+from blog.models import Category, Post
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from personal_portfolio.budgets import BUDGETS, VOLUME, Budget, BudgetExceeded
+from personal_portfolio.sitemaps import DEFAULT_CHUNK_SIZE
+from projects.models import Project
+
+
+class BudgetTest(TestCase):
+    """Every page stays within its budget with a realistic amount of data."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_data", **VOLUME, stdout=StringIO())
+        post = Post.objects.order_by("pk").first()
+        category = Category.objects.first()
+        cls.urls = {
+            "home": reverse("home"),
+            "project_detail": reverse(
+                "project_detail", kwargs={"pk": Project.objects.first().pk}
+            ),
+            "blog_index": reverse("blog_index"),
+            "blog_category": reverse(
+                "blog_category", kwargs={"category": Category.objects.first().slug}
+            ),
+            "blog_search": f"{reverse('blog_search')}?q={post.title.split()[0]}",
+            # the first post gets the most comments from seed_data
+            "blog_detail": reverse("blog_detail", kwargs={"pk": post.pk}),
+            "blog_comments": reverse("blog_comments", kwargs={"pk": post.pk}),
+            "blog_feed": reverse("blog_feed", kwargs={"feed_format": "atom"}),
+            "blog_category_feed": reverse(
+                "blog_category_feed",
+                kwargs={"category": category.slug, "feed_format": "rss"},
+            ),
+            "cv": reverse("cv"),
+            "sitemap_index": reverse("sitemap_index"),
+            "sitemap_pages": reverse("sitemap_pages"),
+            "sitemap_posts": reverse(
+                "sitemap_posts", kwargs={"chunk": post.pk // DEFAULT_CHUNK_SIZE}
+            ),
+        }
+
+    def test_every_budget_is_checked(self):
+        self.assertEqual(set(BUDGETS), set(self.urls))
+
+    def test_query_budgets(self):
+        # BudgetTestRunner fails a request that runs over its budget
+        for url_name, url in self.urls.items():
+            with self.subTest(url_name):
+                self.assertEqual(200, self.client.get(url).status_code)
+
+    # wall-clock times depend on the machine and what else it's running
+    @skipUnless(os.getenv("CHECK_RENDER_TIME") == "1", "CHECK_RENDER_TIME isn't 1")
+    def test_render_time(self):
+        for url_name, url in self.urls.items():
+            with self.subTest(url_name):
+                self.client.get(url)
+                timings = []
+                for _ in range(5):
+                    start = time.perf_counter()
+                    response = self.client.get(url)
+                    timings.append((time.perf_counter() - start) * 1000)
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(
+                    statistics.median(timings), BUDGETS[url_name].ms, url
+                )
+
+    def test_query_budget_is_enforced(self):
+        with mock.patch.dict(BUDGETS, {"blog_index": Budget(queries=1, ms=100)}):
+            with self.assertRaisesMessage(BudgetExceeded, "blog_index budget is 1"):
+                self.client.get(self.urls["blog_index"])
+
+    def test_query_budget_ignores_errors(self):
+        url = reverse("project_detail", args=[Project.objects.count() + 1000])
+        with mock.patch.dict(BUDGETS, {"project_detail": Budget(queries=0, ms=50)}):
+            with self.assertRaises(Project.DoesNotExist):
+                self.client.get(url)
@@ -0,0 +1,172 @@
+import re
+
+from blog.models import Category, Comment, Post
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from personal_portfolio.cache import cached_page
+from projects.models import Project
+
+
+@override_settings(PAGE_CACHE=True)
+class PageCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Django")
+        cls.posts = [
+            Post.objects.create(title=f"Blog Post {i}", body="This is the body...")
+            for i in range(2)
+        ]
+        for post in cls.posts:
+            post.categories.add(cls.category)
+        cls.project = Project.objects.create(
+            title="Web Scraper",
+            description="This scrapes websites.",
+            summary="This scrapes...",
+            technology="scrapy",
+            image="img/JL.png",
+            repo="https://github.com/LucasSD/web-scraping",
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    # a cached page only runs its conditional GET validator query, and the
+    # blog index's validators come from the cache
+    def assertCached(self, url):
+        with self.assertNumQueries(0 if url == reverse("blog_index") else 1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assertNotCached(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertGreater(len(queries), 1, f"{url} was served from the cache")
+
+    def detail_url(self, post):
+        return reverse("blog_detail", kwargs={"pk": post.pk})
+
+    def warm(self, *urls):
+        for url in urls:
+            self.client.get(url)
+
+    def test_pages_are_served_from_cache(self):
+        urls = [
+            reverse("blog_index"),
+            reverse("blog_category", kwargs={"category": self.category.slug}),
+            self.detail_url(self.posts[0]),
+            reverse("home"),
+            reverse("project_detail", kwargs={"pk": self.project.pk}),
+        ]
+        for url in urls:
+            first = self.client.get(url)
+            second = self.assertCached(url)
+            # identical apart from the per-visitor CSRF token
+            token = re.compile(rb'value="[^"]*"')
+            self.assertEqual(
+                token.sub(b"", first.content), token.sub(b"", second.content)
+            )
+
+    def test_comment_invalidates_only_its_post(self):
+        first, second = (self.detail_url(post) for post in self.posts)
+        self.warm(reverse("blog_index"), first, second)
+
+        Comment.objects.create(author="Lucas", body="Nice!", post=self.posts[0])
+
+        self.assertNotCached(first)
+        self.assertCached(second)
+        self.assertCached(reverse("blog_index"))
+        self.assertContains(self.client.get(first), "Nice!")
+
+    def test_post_edit_invalidates_listings_and_its_detail(self):
+        first, second = (self.detail_url(post) for post in self.posts)
+        index = reverse("blog_index")
+        self.warm(index, first, second)
+
+        post = self.posts[0]
+        post.title = "Edited title"
+        post.save()
+
+        self.assertNotCached(index)
+        self.assertNotCached(first)
+        self.assertCached(second)
+
+    def test_category_change_invalidates_its_posts(self):
+        urls = [self.detail_url(post) for post in self.posts]
+        self.warm(*urls)
+
+        self.category.name = "Python"
+        self.category.save()
+
+        for url in urls:
+            self.assertNotCached(url)
+
+    def test_removing_category_invalidates_post(self):
+        first, second = (self.detail_url(post) for post in self.posts)
+        self.warm(first, second)
+
+        self.posts[0].categories.remove(self.category)
+
+        self.assertNotCached(first)
+        self.assertCached(second)
+
+    def test_project_edit_invalidates_project_pages(self):
+        index = reverse("home")
+        detail = reverse("project_detail", kwargs={"pk": self.project.pk})
+        self.warm(index, detail, reverse("blog_index"))
+
+        self.project.summary = "Scrapes faster"
+        self.project.save()
+
+        self.assertNotCached(index)
+        self.assertNotCached(detail)
+        self.assertCached(reverse("blog_index"))
+
+    def test_cached_page_gets_fresh_csrf_token(self):
+        url = self.detail_url(self.posts[0])
+        self.warm(url)
+
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(url)
+        self.assertNotContains(response, "__csrf_token__")
+        token = response.content.split(b'name="csrfmiddlewaretoken" value="')[1]
+        token = token.split(b'"')[0].decode()
+
+        response = client.post(
+            url,
+            {"author": "Formy", "body": "Hello", "csrfmiddlewaretoken": token},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Comment.objects.filter(author="Formy").exists())
+
+    def test_headers_are_cached(self):
+        calls = []
+
+        @cached_page("posts")
+        def view(request):
+            calls.append(request)
+            response = HttpResponse("[]", content_type="application/json")
+            response["Content-Language"] = "en"
+            return response
+
+        for _ in range(2):
+            response = view(RequestFactory().get("/"))
+            self.assertEqual("application/json", response["Content-Type"])
+            self.assertEqual("en", response["Content-Language"])
+        self.assertEqual(1, len(calls))
+
+    def test_query_parameter_order_doesnt_matter(self):
+        comments = reverse("blog_comments", kwargs={"pk": self.posts[0].pk})
+        self.warm(f"{comments}?since=1&format=html")
+        self.assertCached(f"{comments}?format=html&since=1")
+
+    def test_unknown_query_parameters_skip_the_cache(self):
+        url = reverse("blog_category", kwargs={"category": self.category.slug})
+        self.warm(url, f"{url}?utm_source=feed")
+        self.assertNotCached(f"{url}?utm_source=feed")
+        self.assertNotCached(f"{url}?after=abc&x=1")
+        self.assertCached(url)
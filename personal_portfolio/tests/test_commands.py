@@ -0,0 +1,214 @@
+import cProfile
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from blog import search
+from blog.models import Category, Comment, Post
+from django.core.management import CommandError, call_command
+from django.test import Client, TestCase, override_settings
+from projects.models import Project
+
+
+class SeedDataCommandTest(TestCase):
+    def test_seeds_requested_volumes(self):
+        call_command(
+            "seed_data",
+            posts=30,
+            categories=4,
+            categories_per_post=2,
+            comments=100,
+            projects=3,
+            batch_size=7,
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(30, Post.objects.count())
+        self.assertEqual(4, Category.objects.count())
+        self.assertEqual(60, Post.categories.through.objects.count())
+        self.assertEqual(100, Comment.objects.count())
+        self.assertEqual(3, Project.objects.count())
+
+        post = Post.objects.first()
+        self.assertTrue(post.excerpt)
+        self.assertTrue(post.body_html.startswith("<p>"))
+        word = post.title.split()[0]
+        self.assertTrue(search.search_posts(word))
+
+    def test_can_seed_twice(self):
+        call_command("seed_data", posts=2, categories=2, stdout=StringIO())
+        call_command("seed_data", posts=2, categories=2, stdout=StringIO())
+        self.assertEqual(4, Category.objects.count())
+
+
+class BenchmarkCommandTest(TestCase):
+    def test_reports_every_page(self):
+        call_command("seed_data", posts=15, comments=20, projects=1, stdout=StringIO())
+        out = StringIO()
+        call_command("benchmark", requests=3, warmup=0, stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(15, report["rows"]["posts"])
+        results = report["results"]
+        for name in [
+            "blog_index",
+            "blog_index_page_2",
+            "blog_category",
+            "blog_detail",
+            "project_index",
+            "project_detail",
+            "cv",
+        ]:
+            self.assertEqual(200, results[name]["status"], name)
+            self.assertLessEqual(results[name]["p50_ms"], results[name]["p99_ms"])
+        self.assertEqual(2, results["blog_index"]["queries"])
+        self.assertEqual(0, results["cv"]["queries"])
+
+
+class ProfilesCommandTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings = override_settings(PROFILE_DIR=self.directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_lists_profiles(self):
+        out = StringIO()
+        call_command("profiles", stdout=out)
+        self.assertIn("No profiles", out.getvalue())
+
+        profiler = cProfile.Profile()
+        profiler.runcall(sorted, range(10))
+        profiler.dump_stats(self.directory / "20210101-GET-blog.prof")
+
+        out = StringIO()
+        call_command("profiles", stdout=out)
+        self.assertIn("20210101-GET-blog.prof", out.getvalue())
+
+        out = StringIO()
+        call_command("profiles", "20210101-GET-blog.prof", limit=5, stdout=out)
+        self.assertIn("sorted", out.getvalue())
+
+    def test_missing_profile(self):
+        with self.assertRaises(CommandError):
+            call_command("profiles", "missing.prof", stdout=StringIO())
+
+
+class ExportSiteCommandTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = Path(directory.name) / "site"
+        static_root = Path(directory.name) / "static"
+        (static_root / "bundle").mkdir(parents=True)
+        (static_root / "bundle" / "site.css").write_text("body{}")
+        settings = override_settings(STATIC_ROOT=static_root, PAGE_CACHE=False)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.category = Category.objects.create(name="Django")
+        self.other = Category.objects.create(name="Python")
+        self.post = Post.objects.create(title="First", body="Body", link="http://a.b")
+        self.post.categories.add(self.category)
+        self.untouched = Post.objects.create(
+            title="Second", body="Body", link="http://a.b"
+        )
+        self.untouched.categories.add(self.other)
+        self.project = Project.objects.create(
+            title="Portfolio", description="", summary="", technology="", image=""
+        )
+
+    def export(self, **options):
+        out = StringIO()
+        call_command("export_site", str(self.output), stdout=out, **options)
+        return out.getvalue()
+
+    def page(self, path):
+        return self.output / path / "index.html"
+
+    def inodes(self):
+        return {path: path.stat().st_ino for path in self.output.rglob("index.html")}
+
+    def test_exports_every_page(self):
+        self.assertIn("Rendered 8 of 8 pages", self.export())
+
+        for path in [
+            "",
+            f"{self.project.pk}",
+            "blog",
+            "blog/django",
+            "blog/python",
+            f"blog/{self.post.pk}",
+            f"blog/{self.untouched.pk}",
+            "cv",
+        ]:
+            self.assertTrue(self.page(path).is_file(), path)
+        self.assertIn("First", self.page(f"blog/{self.post.pk}").read_text())
+        self.assertEqual("body{}", (self.output / "static/bundle/site.css").read_text())
+
+    def test_exported_form_takes_token_from_cookie(self):
+        self.export()
+        html = self.page(f"blog/{self.post.pk}").read_text()
+        self.assertIn('name="csrfmiddlewaretoken" value=""', html)
+
+        client = Client(enforce_csrf_checks=True)
+        token = "a" * 32
+        client.cookies["csrftoken"] = token
+        response = client.post(
+            f"/blog/{self.post.pk}/",
+            {"author": "Formy", "body": "Hi", "csrfmiddlewaretoken": token},
+        )
+        self.assertEqual(200, response.status_code)
+
+    def test_renders_only_changed_pages(self):
+        self.export()
+        before = self.inodes()
+
+        self.post.title = "Edited"
+        self.post.save()
+        self.assertIn("Rendered 3 of 8 pages", self.export())
+
+        after = self.inodes()
+        changed = {path for path in after if after[path] != before[path]}
+        self.assertEqual(
+            {
+                self.page("blog"),
+                self.page("blog/django"),
+                self.page(f"blog/{self.post.pk}"),
+            },
+            changed,
+        )
+        self.assertIn("Edited", self.page("blog").read_text())
+        self.assertIn("Rendered 0 of 8 pages", self.export())
+
+    def test_comment_renders_only_its_post(self):
+        self.export()
+        Comment.objects.create(author="Ann", body="Nice", post=self.post)
+        self.assertIn("Rendered 1 of 8 pages", self.export())
+        self.assertIn("Nice", self.page(f"blog/{self.post.pk}").read_text())
+
+    def test_recategorised_post(self):
+        self.export()
+        self.post.categories.set([self.other])
+        self.assertIn("Rendered 4 of 8 pages", self.export())
+        self.assertIn("First", self.page("blog/python").read_text())
+        self.assertNotIn("First", self.page("blog/django").read_text())
+
+    def test_removes_deleted_pages(self):
+        self.export()
+        pk = self.untouched.pk
+        self.untouched.delete()
+        self.other.delete()
+        self.assertIn("removed 2", self.export())
+        self.assertFalse((self.output / f"blog/{pk}").exists())
+        self.assertFalse((self.output / "blog/python").exists())
+
+    def test_project_change(self):
+        self.export()
+        self.project.summary = "Made with Django"
+        self.project.save()
+        self.assertIn("Rendered 2 of 8 pages", self.export())
+        self.assertIn("Rendered 8 of 8 pages", self.export(full=True))
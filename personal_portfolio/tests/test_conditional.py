@@ -0,0 +1,131 @@
+import time
+from unittest import mock
+
+from blog.models import Category, Comment, Post
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from projects.models import Project
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Django")
+        cls.post = Post.objects.create(title="Blog Post", body="This is the body...")
+        cls.post.categories.add(cls.category)
+        cls.project = Project.objects.create(
+            title="Web Scraper",
+            description="This scrapes websites.",
+            summary="This scrapes...",
+            technology="scrapy",
+            image="img/JL.png",
+            repo="https://github.com/LucasSD/web-scraping",
+        )
+        cls.urls = [
+            reverse("blog_index"),
+            reverse("blog_category", kwargs={"category": cls.category.slug}),
+            reverse("blog_detail", kwargs={"pk": cls.post.pk}),
+            reverse("home"),
+            reverse("project_detail", kwargs={"pk": cls.project.pk}),
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def backdate_posts(self):
+        """Make the last change to the posts a few seconds ago."""
+        cache.set("page-tag:posts", time.time_ns() - 10 * 10**9, None)
+
+    def test_validators_are_sent(self):
+        self.backdate_posts()
+        for url in self.urls:
+            response = self.client.get(url)
+            self.assertTrue(response.has_header("ETag"), url)
+            self.assertTrue(response.has_header("Last-Modified"), url)
+
+    def test_no_last_modified_in_the_second_of_a_change(self):
+        response = self.client.get(self.urls[0])
+        self.assertTrue(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Last-Modified"))
+
+    def test_matching_etag_gets_not_modified(self):
+        # the blog index validators come from the page cache tags
+        for url, queries in zip(self.urls, [0, 1, 1, 1, 1]):
+            etag = self.client.get(url)["ETag"]
+            with self.assertNumQueries(queries):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, url)
+            self.assertEqual(b"", response.content)
+
+    def test_if_modified_since(self):
+        self.backdate_posts()
+        for url in self.urls:
+            last_modified = self.client.get(url)["Last-Modified"]
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(response.status_code, 304, url)
+
+    def test_delete_changes_listing_last_modified(self):
+        url = reverse("blog_index")
+        self.backdate_posts()
+        last_modified = self.client.get(url)["Last-Modified"]
+
+        Post.objects.create(title="Another", body="").delete()
+
+        later = time.time() + 2
+        with mock.patch("personal_portfolio.cache.time.time", return_value=later):
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(last_modified, response["Last-Modified"])
+
+    def test_unknown_category_has_no_etag(self):
+        for name in ["missing", self.category.name]:
+            url = reverse("blog_category", kwargs={"category": name})
+            response = self.client.get(url)
+            self.assertIn(response.status_code, (301, 404))
+            self.assertFalse(response.has_header("ETag"), url)
+
+    def test_etags_differ_between_pages(self):
+        etags = {self.client.get(url)["ETag"] for url in self.urls}
+        self.assertEqual(len(self.urls), len(etags))
+
+    def test_new_comment_changes_detail_etag(self):
+        url = reverse("blog_detail", kwargs={"pk": self.post.pk})
+        etag = self.client.get(url)["ETag"]
+
+        Comment.objects.create(author="Lucas", body="Nice!", post=self.post)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(etag, response["ETag"])
+
+    def test_post_edit_changes_listing_etag(self):
+        url = reverse("blog_index")
+        etag = self.client.get(url)["ETag"]
+
+        self.post.title = "New title"
+        self.post.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_category_rename_changes_listing_etag(self):
+        url = reverse("blog_index")
+        etag = self.client.get(url)["ETag"]
+
+        self.category.name = "Python"
+        self.category.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_project_edit_changes_project_etags(self):
+        urls = self.urls[3:]
+        etags = [self.client.get(url)["ETag"] for url in urls]
+
+        self.project.summary = "Scrapes faster"
+        self.project.save()
+
+        for url, etag in zip(urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
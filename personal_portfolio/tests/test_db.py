@@ -0,0 +1,95 @@
+import sqlite3
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import OperationalError
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+
+class TunedSQLiteTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = str(Path(directory.name) / "db.sqlite3")
+
+    def connect(self, **options):
+        handler = ConnectionHandler(
+            {
+                "default": {
+                    "ENGINE": "personal_portfolio.db.sqlite3",
+                    "NAME": self.path,
+                    "OPTIONS": options,
+                }
+            }
+        )
+        connection = handler["default"]
+        self.addCleanup(connection.close)
+        return connection
+
+    def lock_database(self):
+        """Hold the write lock from another connection, like a slow writer."""
+        other = sqlite3.connect(
+            self.path, isolation_level=None, check_same_thread=False
+        )
+        self.addCleanup(other.close)
+        other.execute("CREATE TABLE IF NOT EXISTS t (x INTEGER)")
+        other.execute("BEGIN EXCLUSIVE")
+        return other
+
+    def test_pragmas_are_applied(self):
+        connection = self.connect(
+            timeout=1, pragmas={"journal_mode": "WAL", "synchronous": "NORMAL"}
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual("wal", cursor.fetchone()[0])
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(1, cursor.fetchone()[0])
+
+    def test_rejects_unknown_pragmas(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.connect(pragmas={"writable_schema": "ON"})
+
+    def test_transaction_mode(self):
+        connection = self.connect(transaction_mode="IMMEDIATE")
+        connection.ensure_connection()
+        connection._start_transaction_under_autocommit()
+        self.addCleanup(connection.connection.rollback)
+
+        other = sqlite3.connect(self.path, timeout=0, isolation_level=None)
+        self.addCleanup(other.close)
+        with self.assertRaisesMessage(sqlite3.OperationalError, "locked"):
+            other.execute("BEGIN IMMEDIATE")
+
+    def test_retries_when_locked(self):
+        other = self.lock_database()
+        threading.Timer(0.2, other.execute, ["COMMIT"]).start()
+
+        connection = self.connect(timeout=0.01, retries=8, retry_backoff=0.05)
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO t VALUES (1)")
+            cursor.execute("SELECT count(*) FROM t")
+            self.assertEqual(1, cursor.fetchone()[0])
+
+    def test_gives_up_after_retries(self):
+        self.lock_database()
+
+        connection = self.connect(timeout=0.01, retries=1, retry_backoff=0.01)
+        with self.assertRaises(OperationalError), connection.cursor() as cursor:
+            cursor.execute("INSERT INTO t VALUES (1)")
+
+
+class StressDbCommandTest(SimpleTestCase):
+    def test_reports_both_setups(self):
+        out = StringIO()
+        call_command("stress_db", seconds=0.3, readers=2, writers=2, stdout=out)
+
+        default, configured = out.getvalue().splitlines()
+        self.assertIn("default:", default)
+        self.assertIn("configured:", configured)
+        self.assertIn(" 0 lock errors", configured)
@@ -0,0 +1,191 @@
+import re
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+from blog.models import Post
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from personal_portfolio.metrics import Registry, registry
+from personal_portfolio.timing import RequestTimer
+
+SERVER_TIMING = re.compile(
+    r'db;dur=(?P<db>[\d.]+);desc="(?P<queries>\d+) queries", '
+    r"tpl;dur=(?P<tpl>[\d.]+), total;dur=(?P<total>[\d.]+)"
+)
+
+
+class ServerTimingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Post.objects.create(title="Blog Post", body="This is the body...")
+
+    def server_timing(self, url):
+        response = self.client.get(url)
+        match = SERVER_TIMING.fullmatch(response["Server-Timing"])
+        self.assertIsNotNone(match, response["Server-Timing"])
+        return match
+
+    def test_header_reports_queries_and_templates(self):
+        timing = self.server_timing(reverse("blog_index"))
+        self.assertEqual("2", timing["queries"])
+        self.assertGreater(float(timing["tpl"]), 0)
+        self.assertGreaterEqual(
+            float(timing["total"]), float(timing["db"]) + float(timing["tpl"])
+        )
+
+    def test_header_without_queries(self):
+        timing = self.server_timing(reverse("cv"))
+        self.assertEqual("0", timing["queries"])
+        self.assertEqual(0, float(timing["db"]))
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_slow_requests_are_logged_with_sql(self):
+        with self.assertLogs("personal_portfolio.performance", "WARNING") as logs:
+            self.client.get(reverse("blog_index"))
+        self.assertIn("Slow request GET /blog/", logs.output[0])
+        self.assertIn("2 queries", logs.output[0])
+        self.assertIn('FROM "blog_post"', logs.output[0])
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=60 * 1000)
+    def test_fast_requests_are_not_logged(self):
+        with self.assertRaises(AssertionError):
+            with self.assertLogs("personal_portfolio.performance"):
+                self.client.get(reverse("blog_index"))
+
+
+class RequestTimerTest(SimpleTestCase):
+    def test_nested_renders_are_counted_once(self):
+        timer = RequestTimer()
+        clock = iter(range(1, 100))
+        with mock.patch("personal_portfolio.timing.time.perf_counter", clock.__next__):
+            timer.time_render(lambda: timer.time_render(lambda: "inner"))
+        self.assertEqual(1, timer.template_time)
+        self.assertEqual(0, timer.render_depth)
+
+
+@override_settings(METRICS_ENABLED=True)
+class MetricsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Post.objects.create(title="Blog Post", body="This is the body...")
+
+    def setUp(self):
+        registry.reset()
+
+    def test_disabled_by_default(self):
+        with self.settings(METRICS_ENABLED=False):
+            self.client.get(reverse("blog_index"))
+            response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual({}, registry.collect())
+
+    def test_requests_are_recorded_per_url_name(self):
+        self.client.get(reverse("blog_index"))
+        self.client.get(reverse("blog_index"))
+        self.client.get(reverse("cv"))
+        self.client.get("/blog/999/comments/")
+
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        text = response.content.decode()
+        self.assertIn('http_request_duration_seconds_count{view="blog_index"} 2', text)
+        self.assertIn('http_request_duration_seconds_count{view="cv"} 1', text)
+        self.assertIn(
+            'http_request_db_queries_bucket{view="blog_index",le="2"} 2', text
+        )
+        self.assertIn(
+            'http_request_db_queries_bucket{view="blog_index",le="1"} 0', text
+        )
+        self.assertIn('http_request_db_queries_bucket{view="cv",le="0"} 1', text)
+        self.assertIn('http_responses_total{view="blog_index",status="200"} 2', text)
+        self.assertIn('http_responses_total{view="blog_comments",status="404"} 1', text)
+        self.assertIn('http_response_size_bytes_bucket{view="cv",le="+Inf"} 1', text)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token(self):
+        self.assertEqual(403, self.client.get(reverse("metrics")).status_code)
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer x")
+        self.assertEqual(403, response.status_code)
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(200, response.status_code)
+
+
+class RegistryTest(TestCase):
+    def test_threads_are_merged(self):
+        metrics = Registry()
+
+        def record():
+            for _ in range(100):
+                metrics.observe("blog_index", 200, 0.02, 2048, 3)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        merged = metrics.collect()["blog_index"]
+        self.assertEqual(400, sum(merged.latency.counts))
+        self.assertEqual({200: 400}, merged.statuses)
+        self.assertAlmostEqual(8.0, merged.latency.sum)
+
+
+class ProfilingMiddlewareTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        settings = self.settings(
+            PROFILING_ENABLED=True, PROFILE_DIR=self.directory.name
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.staff = User.objects.create_user("lucas", password="pw", is_staff=True)
+
+    def profiles(self):
+        return list(Path(self.directory.name).glob("*.prof"))
+
+    def test_staff_request_is_profiled(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse("blog_index"), {"profile": "1"})
+
+        self.assertEqual(response.status_code, 200)
+        [profile] = self.profiles()
+        self.assertEqual(profile.name, response["X-Profile"])
+        self.assertIn("GET-blog", profile.name)
+
+    def test_header_trigger(self):
+        self.client.force_login(self.staff)
+        self.client.get(reverse("cv"), HTTP_X_PROFILE="1")
+        self.assertEqual(1, len(self.profiles()))
+
+    def test_only_when_asked(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse("blog_index"))
+        self.assertFalse(response.has_header("X-Profile"))
+        self.assertEqual([], self.profiles())
+
+    def test_anonymous_and_non_staff_are_not_profiled(self):
+        self.client.get(reverse("blog_index"), {"profile": "1"})
+        self.client.force_login(User.objects.create_user("reader", password="pw"))
+        self.client.get(reverse("blog_index"), {"profile": "1"})
+        self.assertEqual([], self.profiles())
+
+    def test_disabled(self):
+        self.client.force_login(self.staff)
+        with self.settings(PROFILING_ENABLED=False):
+            self.client.get(reverse("blog_index"), {"profile": "1"})
+        self.assertEqual([], self.profiles())
+
+    @override_settings(PROFILE_RATE_LIMIT=2)
+    def test_rate_limit(self):
+        self.client.force_login(self.staff)
+        for _ in range(4):
+            response = self.client.get(reverse("cv"), {"profile": "1"})
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(2, len(self.profiles()))
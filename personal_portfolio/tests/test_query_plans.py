@@ -0,0 +1,90 @@
+from blog.models import Category, Comment, Post
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from projects.models import Project
+
+
+class QueryPlanTest(TestCase):
+    """Every SELECT a page runs must be answered from an index."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Django")
+        for i in range(20):
+            post = Post.objects.create(title=f"Blog Post {i}", body="body")
+            post.categories.add(cls.category)
+            for j in range(3):
+                Comment.objects.create(author="Lucas", body="blah", post=post)
+        cls.post = post
+        cls.project = Project.objects.create(
+            title="Web Scraper",
+            description="This scrapes websites.",
+            summary="This scrapes...",
+            technology="scrapy",
+            image="img/JL.png",
+            repo="https://github.com/LucasSD/web-scraping",
+            order=1,
+        )
+
+    def query_plans(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries:
+                if not query["sql"].startswith("SELECT"):
+                    continue
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                plans.append((query["sql"], [row[-1] for row in cursor.fetchall()]))
+        return plans
+
+    def assertIndexedPlans(self, url, allow_sort=False, whole_tables=()):
+        """Fail if a query on ``url`` reads more of a table than it returns.
+
+        "SCAN t USING [COVERING] INDEX i" walks an index in order, which only
+        stops early when the query has a LIMIT, so it's allowed on its own
+        just for the tables in ``whole_tables`` that the page lists in full.
+        """
+        for sql, plan in self.query_plans(url):
+            for step in plan:
+                if step.startswith("SCAN"):
+                    table = step.split()[1]
+                    if "USING" not in step:
+                        self.fail(f"{url} scans a table: {step}\n{sql}")
+                    if " LIMIT " not in sql and table not in whole_tables:
+                        self.fail(f"{url} walks a whole index: {step}\n{sql}")
+                if "TEMP B-TREE" in step and not allow_sort:
+                    self.fail(f"{url} sorts without an index: {step}\n{sql}")
+
+    def test_blog_index(self):
+        url = reverse("blog_index")
+        self.assertIndexedPlans(url)
+        cursor = self.client.get(url).context["page"].next_cursor
+        self.assertIndexedPlans(f"{url}?after={cursor}")
+
+    def test_blog_category(self):
+        # the category's posts are found through the join table and sorted,
+        # which costs the size of the category rather than of the blog
+        url = reverse("blog_category", kwargs={"category": self.category.slug})
+        self.assertIndexedPlans(url, allow_sort=True)
+
+    def test_blog_detail(self):
+        self.assertIndexedPlans(reverse("blog_detail", kwargs={"pk": self.post.pk}))
+
+    def test_blog_comments(self):
+        url = reverse("blog_comments", kwargs={"pk": self.post.pk})
+        comment = Comment.objects.filter(post=self.post).first()
+        self.assertIndexedPlans(f"{url}?since={comment.pk}")
+
+    def test_project_index(self):
+        # the home page lists every project
+        self.assertIndexedPlans(reverse("home"), whole_tables={"projects_project"})
+
+    def test_project_detail(self):
+        self.assertIndexedPlans(
+            reverse("project_detail", kwargs={"pk": self.project.pk})
+        )
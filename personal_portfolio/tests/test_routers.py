@@ -0,0 +1,115 @@
+import time
+from unittest import mock
+
+from blog.models import Post
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from projects.models import Project
+
+from personal_portfolio.cache import cached_page
+from personal_portfolio.middleware import ReplicaMiddleware
+from personal_portfolio.routers import ReplicaRouter, use_primary, use_replica
+
+router = ReplicaRouter()
+
+
+def read_db(request):
+    return HttpResponse(router.db_for_read(Post))
+
+
+@mock.patch("personal_portfolio.routers.replica_configured", return_value=True)
+class ReplicaRouterTest(SimpleTestCase):
+    def test_reads_from_primary_by_default(self, configured):
+        self.assertEqual("default", router.db_for_read(Post))
+
+    def test_reads_content_from_replica(self, configured):
+        with use_replica():
+            self.assertEqual("replica", router.db_for_read(Post))
+            self.assertEqual("replica", router.db_for_read(Project))
+
+    def test_reads_users_and_sessions_from_primary(self, configured):
+        with use_replica():
+            self.assertEqual("default", router.db_for_read(User))
+
+    def test_writes_go_to_primary(self, configured):
+        with use_replica():
+            self.assertEqual("default", router.db_for_write(Post))
+
+    def test_use_primary(self, configured):
+        with use_replica():
+            with use_primary():
+                self.assertEqual("default", router.db_for_read(Post))
+            self.assertEqual("replica", router.db_for_read(Post))
+
+    def test_follows_instance(self, configured):
+        post = Post(pk=1)
+        post._state.db = "default"
+        with use_replica():
+            self.assertEqual("default", router.db_for_read(Post, instance=post))
+
+    def test_without_replica(self, configured):
+        configured.return_value = False
+        with use_replica():
+            self.assertEqual("default", router.db_for_read(Post))
+
+    def test_replica_is_not_migrated(self, configured):
+        self.assertFalse(router.allow_migrate("replica", "blog"))
+        self.assertTrue(router.allow_migrate("default", "blog"))
+
+
+@mock.patch("personal_portfolio.middleware.replica_configured", return_value=True)
+@mock.patch("personal_portfolio.routers.replica_configured", return_value=True)
+@override_settings(REPLICA_PIN_SECONDS=30)
+class ReplicaMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = ReplicaMiddleware(read_db)
+
+    def test_reads_from_replica(self, *mocks):
+        response = self.middleware(self.factory.get("/"))
+        self.assertEqual(b"replica", response.content)
+        self.assertNotIn("pin_primary", response.cookies)
+
+    def test_write_pins_to_primary(self, *mocks):
+        response = self.middleware(self.factory.post("/"))
+        self.assertEqual(b"default", response.content)
+        self.assertEqual(30, response.cookies["pin_primary"]["max-age"])
+
+    def test_pinned_reads_from_primary(self, *mocks):
+        request = self.factory.get("/")
+        request.COOKIES["pin_primary"] = "1"
+        self.assertEqual(b"default", self.middleware(request).content)
+
+    def test_failed_write_does_not_pin(self, *mocks):
+        middleware = ReplicaMiddleware(lambda request: HttpResponse(status=400))
+        response = middleware(self.factory.post("/"))
+        self.assertNotIn("pin_primary", response.cookies)
+
+
+@mock.patch("personal_portfolio.routers.replica_configured", return_value=True)
+@override_settings(PAGE_CACHE=True)
+class CachedPageRoutingTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_pages_are_rendered_from_replica(self, configured):
+        cache.set("page-tag:posts", time.time_ns() - 60 * 10**9, None)
+        view = cached_page("posts")(read_db)
+        with use_replica():
+            self.assertEqual(b"replica", view(RequestFactory().get("/")).content)
+
+    @override_settings(REPLICA_PIN_SECONDS=30)
+    def test_recently_changed_pages_are_rendered_from_primary(self, configured):
+        cache.set("page-tag:posts", time.time_ns() - 60 * 10**9, None)
+        cache.set("page-tag:post:1", time.time_ns() - 20 * 10**9, None)
+        view = cached_page("posts", "post:{pk}")(lambda request, pk: read_db(request))
+        with use_replica():
+            response = view(RequestFactory().get("/"), pk=1)
+        self.assertEqual(b"default", response.content)
+
+    def test_uncached_pages_are_rendered_from_replica(self, configured):
+        view = cached_page("posts", bypass=lambda request: True)(read_db)
+        with use_replica():
+            self.assertEqual(b"replica", view(RequestFactory().get("/")).content)
@@ -0,0 +1,82 @@
+from blog.models import Category, Post
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from projects.models import Project
+
+
+@override_settings(SITEMAP_CHUNK_SIZE=2)
+class SitemapTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Django")
+        cls.posts = [
+            Post.objects.create(pk=pk, title=f"Post {pk}", body="", link="http://a.b")
+            for pk in [1, 2, 3, 6]
+        ]
+        cls.posts[0].categories.add(cls.category)
+        cls.project = Project.objects.create(
+            title="Portfolio", description="", summary="", technology="", image=""
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_index(self):
+        response = self.client.get(reverse("sitemap_index"))
+
+        self.assertEqual("application/xml", response["Content-Type"])
+        content = response.content.decode()
+        for name in [
+            "sitemap-pages.xml",
+            "sitemap-posts-0.xml",
+            "sitemap-posts-1.xml",
+            "sitemap-posts-3.xml",
+        ]:
+            self.assertIn(f"<loc>http://testserver/{name}</loc>", content)
+        self.assertNotIn("sitemap-posts-2.xml", content)
+        lastmod = self.posts[-1].last_modified.isoformat(timespec="seconds")
+        self.assertIn(f"<lastmod>{lastmod[:19]}", content)
+
+    def test_pages(self):
+        response = self.client.get(reverse("sitemap_pages"))
+
+        for path in ["", f"{self.project.pk}/", "cv/", "blog/", "blog/django/"]:
+            self.assertContains(response, f"<loc>http://testserver/{path}</loc>")
+        self.assertNotContains(response, "/blog/1/")
+
+    def test_posts_chunk(self):
+        response = self.client.get(reverse("sitemap_posts", args=[1]))
+
+        self.assertContains(response, "<url>", count=2)
+        self.assertContains(response, "<loc>http://testserver/blog/2/</loc>")
+        self.assertContains(response, "<loc>http://testserver/blog/3/</loc>")
+        self.assertEqual(
+            404, self.client.get(reverse("sitemap_posts", args=[2])).status_code
+        )
+
+    @override_settings(PAGE_CACHE=True)
+    def test_edit_renders_only_its_chunk(self):
+        for chunk in [0, 1]:
+            self.client.get(reverse("sitemap_posts", args=[chunk]))
+
+        post = self.posts[2]
+        post.title = "Edited"
+        post.save()
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse("sitemap_posts", args=[0]))
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("sitemap_posts", args=[1]))
+        post.refresh_from_db()
+        lastmod = post.last_modified.isoformat(timespec="seconds")
+        self.assertContains(response, f"<lastmod>{lastmod[:19]}")
+
+    @override_settings(PAGE_CACHE=True, ALLOWED_HOSTS=["testserver", "example.org"])
+    def test_cached_per_origin(self):
+        url = reverse("sitemap_index")
+        self.client.get(url)
+
+        response = self.client.get(url, secure=True, HTTP_HOST="example.org")
+        self.assertContains(response, "<loc>https://example.org/sitemap-pages.xml")
+        self.assertNotContains(response, "http://testserver/")
@@ -0,0 +1,142 @@
+import gzip
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from personal_portfolio import static, storage
+
+
+class CompressedManifestStorageTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = Path(tempfile.mkdtemp())
+        with override_settings(
+            STATIC_ROOT=str(cls.static_root),
+            STATICFILES_STORAGE=(
+                "personal_portfolio.storage.CompressedManifestStaticFilesStorage"
+            ),
+        ):
+            call_command("collectstatic", interactive=False, verbosity=0)
+        cls.manifest = json.loads((cls.static_root / "staticfiles.json").read_text())
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.static_root)
+        super().tearDownClass()
+
+    def test_files_are_content_hashed(self):
+        self.assertRegex(self.manifest["paths"]["cv/lucascv.pdf"], static.HASHED_NAME)
+
+    def test_identical_files_share_a_name(self):
+        paths = self.manifest["paths"]
+        self.assertEqual(paths["img/projects.png"], paths["img/projects2.png"])
+
+    def test_text_is_precompressed(self):
+        css = self.static_root / self.manifest["paths"]["admin/css/base.css"]
+        compressed = Path(f"{css}.gz")
+        self.assertEqual(css.read_bytes(), gzip.decompress(compressed.read_bytes()))
+        self.assertEqual(storage.brotli is not None, Path(f"{css}.br").exists())
+
+    def test_images_are_not_compressed(self):
+        png = self.static_root / self.manifest["paths"]["img/beer.png"]
+        self.assertFalse(Path(f"{png}.gz").exists())
+
+
+@override_settings(SERVE_STATIC=True)
+class ServeStaticTest(SimpleTestCase):
+    hashed = "app.0123456789ab.css"
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        root = Path(directory.name)
+        self.content = b"body { color: red; }\n" * 50
+        (root / self.hashed).write_bytes(self.content)
+        (root / f"{self.hashed}.gz").write_bytes(gzip.compress(self.content))
+        (root / "app.css").write_bytes(self.content)
+        settings = override_settings(STATIC_ROOT=str(root))
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def get(self, path, **headers):
+        return self.client.get(f"/static/{path}", **headers)
+
+    def test_hashed_files_are_immutable(self):
+        response = self.get(self.hashed)
+        self.assertEqual(static.IMMUTABLE, response["Cache-Control"])
+        self.assertEqual("text/css", response["Content-Type"])
+        self.assertEqual(self.content, b"".join(response.streaming_content))
+
+    def test_unhashed_files_are_cached_briefly(self):
+        response = self.get("app.css")
+        self.assertEqual("public, max-age=3600", response["Cache-Control"])
+
+    def test_serves_compressed_copy(self):
+        response = self.get(self.hashed, HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+        self.assertEqual("gzip", response["Content-Encoding"])
+        self.assertEqual("Accept-Encoding", response["Vary"])
+        body = b"".join(response.streaming_content)
+        self.assertEqual(self.content, gzip.decompress(body))
+
+    def test_respects_refused_encoding(self):
+        response = self.get(self.hashed, HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_byte_range(self):
+        response = self.get(self.hashed, HTTP_RANGE="bytes=5-9")
+        self.assertEqual(206, response.status_code)
+        self.assertEqual(f"bytes 5-9/{len(self.content)}", response["Content-Range"])
+        self.assertEqual(self.content[5:10], b"".join(response.streaming_content))
+
+    def test_suffix_range(self):
+        response = self.get(self.hashed, HTTP_RANGE="bytes=-4")
+        self.assertEqual(self.content[-4:], b"".join(response.streaming_content))
+
+    def test_unsatisfiable_range(self):
+        response = self.get(self.hashed, HTTP_RANGE=f"bytes={len(self.content)}-")
+        self.assertEqual(416, response.status_code)
+
+    def test_invalid_ranges_are_ignored(self):
+        for header in ["bytes=5-2", "bytes=0-1,5-6", "bytes=-", "lines=1-2", "5-9"]:
+            with self.subTest(header=header):
+                response = self.get(self.hashed, HTTP_RANGE=header)
+                self.assertEqual(200, response.status_code)
+                self.assertFalse(response.has_header("Content-Range"))
+                self.assertEqual(self.content, b"".join(response.streaming_content))
+
+    def test_empty_suffix_range(self):
+        response = self.get(self.hashed, HTTP_RANGE="bytes=-0")
+        self.assertEqual(416, response.status_code)
+        self.assertEqual(f"bytes */{len(self.content)}", response["Content-Range"])
+
+    def test_if_range(self):
+        last_modified = self.get(self.hashed)["Last-Modified"]
+        response = self.get(
+            self.hashed, HTTP_RANGE="bytes=5-9", HTTP_IF_RANGE=last_modified
+        )
+        self.assertEqual(206, response.status_code)
+        for if_range in ["Mon, 01 Jan 2001 00:00:00 GMT", '"etag"']:
+            with self.subTest(if_range=if_range):
+                response = self.get(
+                    self.hashed, HTTP_RANGE="bytes=5-9", HTTP_IF_RANGE=if_range
+                )
+                self.assertEqual(200, response.status_code)
+                self.assertEqual(self.content, b"".join(response.streaming_content))
+
+    def test_not_modified(self):
+        last_modified = self.get(self.hashed)["Last-Modified"]
+        response = self.get(self.hashed, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(304, response.status_code)
+
+    def test_disabled(self):
+        with override_settings(SERVE_STATIC=False):
+            self.assertEqual(404, self.get(self.hashed).status_code)
+
+    def test_missing_and_outside_files(self):
+        self.assertEqual(404, self.get("missing.css").status_code)
+        self.assertEqual(404, self.get("../settings.py").status_code)
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+from personal_portfolio.template_backend import warm_templates
+
+CACHED_TEMPLATES = [
+    {
+        **settings.TEMPLATES[0],
+        "APP_DIRS": False,
+        "OPTIONS": {
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    }
+]
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class WarmTemplatesTest(SimpleTestCase):
+    def test_templates_are_compiled_into_the_cache(self):
+        count = warm_templates()
+
+        loader = engines.all()[0].engine.template_loaders[0]
+        cached = {name for name in loader.get_template_cache}
+        for name in ["base.html", "cv.html", "blog_index.html", "project_index.html"]:
+            self.assertIn(name, cached)
+        self.assertGreaterEqual(count, len(cached))
+
+    def test_base_dir_template_path(self):
+        self.assertEqual(
+            [settings.BASE_DIR / "personal_portfolio" / "templates"],
+            settings.TEMPLATES[0]["DIRS"],
+        )
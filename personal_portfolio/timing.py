@@ -0,0 +1,72 @@
+"""Per-request accounting of SQL and template rendering time.
+
+``ServerTimingMiddleware`` makes a ``RequestTimer`` current for each
+request. It counts and times every query through a database execute
+wrapper, and ``TimedDjangoTemplates`` adds the time spent rendering
+templates to it.
+"""
+
+import time
+from contextvars import ContextVar
+
+_current = ContextVar("request_timer", default=None)
+
+
+def current_timer():
+    return _current.get()
+
+
+class RequestTimer:
+    def __init__(self, record_sql=False):
+        self.start = time.perf_counter()
+        self.end = None
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.render_depth = 0
+        self.record_sql = record_sql
+        self.queries = []
+
+    def activate(self):
+        return _current.set(self)
+
+    def deactivate(self, token):
+        _current.reset(token)
+        self.end = time.perf_counter()
+
+    @property
+    def total_time(self):
+        return (self.end or time.perf_counter()) - self.start
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.query_count += 1
+            self.sql_time += duration
+            if self.record_sql:
+                self.queries.append((duration, sql))
+
+    def time_render(self, render):
+        """Call ``render``, counting its time less any SQL it ran.
+
+        Templates rendered while another is rendering, by ``render_to_string``
+        in a tag for example, are already counted by the outer render.
+        """
+        if self.render_depth:
+            self.render_depth += 1
+            try:
+                return render()
+            finally:
+                self.render_depth -= 1
+        self.render_depth = 1
+        start = time.perf_counter()
+        sql_before = self.sql_time
+        try:
+            return render()
+        finally:
+            self.render_depth = 0
+            elapsed = time.perf_counter() - start
+            self.template_time += elapsed - (self.sql_time - sql_before)
@@ -13,14 +13,30 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+
+import re
+
+from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+from personal_portfolio import sitemaps, static
+from personal_portfolio.metrics import metrics_view
 from personal_portfolio.views import CvView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("projects.urls")),
     path("blog/", include("blog.urls")),
-    path('cv/', CvView.as_view(), name='cv'),
+    path("cv/", CvView.as_view(), name="cv"),
+    path("sitemap.xml", sitemaps.sitemap_index, name="sitemap_index"),
+    path("sitemap-pages.xml", sitemaps.sitemap_pages, name="sitemap_pages"),
+    path("sitemap-posts-<int:chunk>.xml", sitemaps.sitemap_posts, name="sitemap_posts"),
+    # answers 404 unless METRICS_ENABLED is set
+    path("metrics", metrics_view, name="metrics"),
+    # answers 404 unless SERVE_STATIC is set
+    re_path(
+        rf"^{re.escape(settings.STATIC_URL.lstrip('/'))}(?P<path>.+)$",
+        static.serve,
+        name="static",
+    ),
 ]
-
@@ -14,3 +14,16 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "personal_portfolio.settings")
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if getattr(settings, "TEMPLATE_WARMUP", False):
+    from personal_portfolio.template_backend import warm_templates  # noqa: E402
+
+    warm_templates()
+
+from blog import spool  # noqa: E402
+
+if spool.enabled():
+    # so comments spooled before a restart don't wait for a new one
+    spool.start_worker()
@@ -0,0 +1,109 @@
+import hashlib
+import io
+from pathlib import Path
+
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.models import Project
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+WIDTHS = (320, 640, 960, 1280)
+# most compact first, as browsers take the first <source> they support
+FORMATS = ("avif", "webp", "png")
+SAVE_OPTIONS = {
+    "avif": {"quality": 60},
+    "webp": {"quality": 80, "method": 6},
+    "png": {"optimize": True},
+}
+
+
+def _can_encode(fmt):
+    try:
+        Image.new("RGB", (1, 1)).save(io.BytesIO(), fmt)
+    except (KeyError, OSError, ValueError):
+        return False
+    return True
+
+
+class Command(BaseCommand):
+    help = "Make resized AVIF, WebP and PNG copies of each project's image."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--widths",
+            type=lambda value: sorted(int(width) for width in value.split(",")),
+            default=WIDTHS,
+            help="Comma separated widths, in pixels.",
+        )
+        parser.add_argument(
+            "--formats",
+            type=lambda value: value.split(","),
+            default=FORMATS,
+            help="Comma separated formats, most compact first.",
+        )
+
+    def handle(self, *args, **options):
+        if Image is None:
+            raise CommandError("generate_image_variants needs Pillow installed.")
+        formats = []
+        for fmt in options["formats"]:
+            if fmt not in SAVE_OPTIONS:
+                raise CommandError(f"Unknown image format: {fmt}")
+            if _can_encode(fmt):
+                formats.append(fmt)
+            else:
+                self.stderr.write(f"Skipping {fmt}, Pillow can't encode it here")
+
+        count = 0
+        for project in Project.objects.all():
+            source = finders.find(project.image)
+            if source is None:
+                self.stderr.write(f"Skipping {project}, {project.image} not found")
+                continue
+            count += self.generate(project, Path(source), options["widths"], formats)
+        self.stdout.write(f"Generated {count} image variants")
+
+    def generate(self, project, source, widths, formats):
+        """Write the variants of ``project``'s image next to it and record them."""
+        # the static directory the image was found in
+        static_root = Path(str(source)[: -len(project.image)])
+        digest = hashlib.md5(source.read_bytes()).hexdigest()[:8]
+        directory = (Path(project.image).parent / "variants").as_posix()
+        prefix = f"{directory}/{source.stem}-{digest}"
+
+        count = 0
+        variants = []
+        with Image.open(source) as image:
+            original_width, original_height = image.size
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+            sizes = [w for w in widths if w < original_width] + [
+                min(original_width, widths[-1])
+            ]
+            for width in sorted(set(sizes)):
+                height = round(original_height * width / original_width)
+                resized = None
+                for fmt in formats:
+                    path = f"{prefix}-{width}.{fmt}"
+                    target = static_root / path
+                    # a changed image gets a new digest, so existing files are current
+                    if not target.exists():
+                        if resized is None:
+                            resized = image.resize((width, height), Image.LANCZOS)
+                        target.parent.mkdir(parents=True, exist_ok=True)
+                        resized.save(target, fmt, **SAVE_OPTIONS[fmt])
+                        count += 1
+                    variants.append(
+                        {"path": path, "format": fmt, "width": width, "height": height}
+                    )
+
+        project.image_width = original_width
+        project.image_height = original_height
+        project.image_variants = variants
+        project.save()
+        return count
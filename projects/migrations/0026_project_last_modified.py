@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0025_auto_20210714_1924'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='last_modified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.1.7 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0026_project_last_modified'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['order'], name='project_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['last_modified'], name='project_modified_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.1.7 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0027_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='image_height',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_variants',
+            field=models.JSONField(default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_width',
+            field=models.PositiveIntegerField(editable=False, null=True),
+        ),
+    ]
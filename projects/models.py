@@ -1,4 +1,5 @@
 from django.db import models
+from django.urls import reverse
 
 
 class Project(models.Model):
@@ -7,8 +8,22 @@ class Project(models.Model):
     summary = models.CharField(max_length=100)
     technology = models.CharField(max_length=100)
     image = models.CharField(max_length=100)
+    # resized copies of the image, made by the generate_image_variants command
+    image_width = models.PositiveIntegerField(null=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, editable=False)
+    image_variants = models.JSONField(default=list, editable=False)
     repo = models.URLField()
     order = models.SmallIntegerField(null=True)
+    last_modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["order"], name="project_order_idx"),
+            models.Index(fields=["last_modified"], name="project_modified_idx"),
+        ]
 
     def __str__(self):
         return self.title
+
+    def get_absolute_url(self):
+        return reverse("project_detail", kwargs={"pk": self.pk})
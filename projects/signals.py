@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from personal_portfolio.cache import invalidate
+
+from projects.models import Project
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_pages(sender, instance, **kwargs):
+    invalidate("projects", f"project:{instance.pk}")
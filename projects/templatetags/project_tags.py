@@ -0,0 +1,48 @@
+from django import template
+from django.templatetags.static import static
+
+register = template.Library()
+
+
+def _collected(variant):
+    """Whether ``variant`` has been collected, and so has a static URL.
+
+    generate_image_variants records the variants as soon as it has written
+    them, and the manifest storage can't name them until collectstatic.
+    """
+    try:
+        static(variant["path"])
+    except ValueError:
+        return False
+    return True
+
+
+def _srcset(variants):
+    return ", ".join(f"{static(v['path'])} {v['width']}w" for v in variants)
+
+
+@register.inclusion_tag("_responsive_image.html")
+def responsive_image(project, sizes, css_class="", loading="lazy"):
+    """Render ``project``'s image with its resized variants as sources.
+
+    Browsers pick the smallest variant for the width given by ``sizes`` in
+    the first format they support. The image's own width and height let
+    them lay out the page before it has loaded.
+    """
+    by_format = {}
+    for variant in filter(_collected, project.image_variants):
+        by_format.setdefault(variant["format"], []).append(variant)
+    # PNG, which every browser decodes, is the <img> itself
+    fallback = by_format.pop("png", [])
+    return {
+        "project": project,
+        "sizes": sizes,
+        "css_class": css_class,
+        "loading": loading,
+        "sources": [
+            {"type": f"image/{fmt}", "srcset": _srcset(variants)}
+            for fmt, variants in by_format.items()
+        ],
+        "src": static(fallback[-1]["path"] if fallback else project.image),
+        "srcset": _srcset(fallback),
+    }
@@ -0,0 +1,52 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import skipIf, skipUnless
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from projects.management.commands.generate_image_variants import Image
+from projects.models import Project
+
+
+class GenerateImageVariantsCommandTest(TestCase):
+    def setUp(self):
+        self.static_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.static_dir)
+        self.project = Project.objects.create(
+            title="Web Scraper",
+            description="This scrapes websites.",
+            summary="This scrapes...",
+            technology="scrapy",
+            image="img/shot.png",
+            repo="https://github.com/LucasSD/web-scraping",
+        )
+
+    @skipIf(Image is not None, "Pillow is installed")
+    def test_needs_pillow(self):
+        with self.assertRaisesMessage(CommandError, "Pillow"):
+            call_command("generate_image_variants", stdout=StringIO())
+
+    @skipUnless(Image is not None, "Pillow isn't installed")
+    def test_generates_variants(self):
+        (self.static_dir / "img").mkdir()
+        Image.new("RGB", (1000, 500), "red").save(self.static_dir / "img" / "shot.png")
+
+        with override_settings(STATICFILES_DIRS=[str(self.static_dir)]):
+            call_command(
+                "generate_image_variants",
+                widths=[320, 640, 1280],
+                formats=["webp", "png"],
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+
+        self.project.refresh_from_db()
+        size = (self.project.image_width, self.project.image_height)
+        self.assertEqual((1000, 500), size)
+        widths = sorted({v["width"] for v in self.project.image_variants})
+        self.assertEqual([320, 640, 1000], widths)
+        for variant in self.project.image_variants:
+            with Image.open(self.static_dir / variant["path"]) as image:
+                self.assertEqual((variant["width"], variant["height"]), image.size)
@@ -1,4 +1,8 @@
-from django.test import TestCase
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from projects.models import Project
 
@@ -126,3 +130,75 @@ class ProjectDetailViewTest(TestCase):
             self.assertEqual("This scrapes...", project.summary)
             self.assertEqual("This scrapes websites.", project.description)
             self.assertEqual(f"Web Scraper {project.id - 1}", project.title)
+
+
+class ProjectImageTest(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(
+            title="Web Scraper",
+            description="This scrapes websites.",
+            summary="This scrapes...",
+            technology="scrapy",
+            image="img/JL.png",
+            repo="https://github.com/LucasSD/web-scraping",
+        )
+
+    def test_image_without_variants(self):
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, 'src="/static/img/JL.png"')
+        self.assertContains(response, 'loading="lazy"')
+        self.assertNotContains(response, "srcset")
+
+    def test_image_variants(self):
+        self.project.image_width = 1600
+        self.project.image_height = 900
+        self.project.image_variants = [
+            {
+                "path": f"img/variants/JL-{width}.{fmt}",
+                "format": fmt,
+                "width": width,
+                "height": width * 9 // 16,
+            }
+            for width in (320, 640)
+            for fmt in ("webp", "png")
+        ]
+        self.project.save()
+
+        response = self.client.get(reverse("home"))
+
+        self.assertContains(
+            response,
+            '<source type="image/webp" srcset="/static/img/variants/JL-320.webp 320w, '
+            '/static/img/variants/JL-640.webp 640w"',
+        )
+        self.assertContains(response, 'src="/static/img/variants/JL-640.png"')
+        self.assertContains(response, 'width="1600" height="900"')
+
+    def test_uncollected_variants_are_skipped(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        storage = "personal_portfolio.storage.CompressedManifestStaticFilesStorage"
+        with override_settings(STATIC_ROOT=static_root, STATICFILES_STORAGE=storage):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            self.project.image = "img/jl_image.png"
+            self.project.image_variants = [
+                {
+                    "path": f"img/variants/jl_image-320.{fmt}",
+                    "format": fmt,
+                    "width": 320,
+                }
+                for fmt in ("webp", "png")
+            ]
+            self.project.save()
+
+            response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'src="/static/img/jl_image.')
+        self.assertNotContains(response, "variants")
+
+    def test_detail_image_is_not_lazy(self):
+        response = self.client.get(
+            reverse("project_detail", kwargs={"pk": self.project.pk})
+        )
+        self.assertContains(response, 'loading="eager"')
@@ -1,14 +1,35 @@
+from django.db.models import Count, Max
 from django.shortcuts import render
+from personal_portfolio.cache import cached_page
+from personal_portfolio.conditional import conditional_page
 
 from projects.models import Project
 
 
+def _index_validators(request):
+    stats = Project.objects.aggregate(latest=Max("last_modified"), count=Count("id"))
+    return f"{stats['latest']}|{stats['count']}", stats["latest"]
+
+
+def _detail_validators(request, pk):
+    last_modified = (
+        Project.objects.filter(pk=pk).values_list("last_modified", flat=True).first()
+    )
+    if last_modified is None:
+        return None
+    return str(last_modified), last_modified
+
+
+@conditional_page(_index_validators, "projects")
+@cached_page("projects")
 def project_index(request):
     projects = Project.objects.all().order_by("order")
     context = {"projects": projects}
     return render(request, "project_index.html", context)
 
 
+@conditional_page(_detail_validators, "project:{pk}")
+@cached_page("project:{pk}")
 def project_detail(request, pk):
     project = Project.objects.get(pk=pk)
     context = {"project": project}